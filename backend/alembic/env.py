@@ -4,8 +4,12 @@ import sys
 import os
 import traceback
 import time
+import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
-from sqlalchemy import engine_from_config, pool, text
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
 
 # Set up logging
@@ -13,19 +17,20 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("alembic.env")
 
 # Add your project directory to Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
 import db
+# Fail fast if another db module shadows the app's (it would open its own pool)
+assert os.path.dirname(os.path.abspath(db.__file__)) == BACKEND_DIR, f"db imported from {db.__file__}"
 from models import Base
 
 # Alembic Config object
 config = context.config
 
-# Override connection string with our db module
+# Resolve the connection string once; online and offline runs both use exactly this URL
 try:
-    db_url = db._db_url()
-    masked_url = db_url.split('@')[0].split(':')[0] + ":****@" + db_url.split('@')[1]
-    logger.info(f"Using database URL: {masked_url}")
-    config.set_main_option("sqlalchemy.url", db_url)
+    DB_URL = db._db_url()
+    logger.info(f"Using database URL: {db.mask_db_url(DB_URL)}")
 except Exception as e:
     logger.error(f"Error setting up database URL: {e}")
     traceback.print_exc()
@@ -40,9 +45,8 @@ target_metadata = Base.metadata
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
-    url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url,
+        url=DB_URL,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
@@ -53,65 +57,82 @@ def run_migrations_offline() -> None:
 
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
-    retries = 3
-    
+def do_run_migrations(connection) -> None:
+    """Run migrations on a sync connection handed over by run_sync."""
+    # Configure context with connection
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # Use transaction_per_migration for isolated changes
+        transaction_per_migration=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def connect_with_retry(engine, retries: int = 7):
+    """Open the migration connection, retrying only the connect with jittered exponential backoff."""
     for attempt in range(retries):
         try:
-            # Use our engine directly to ensure proper connection
-            engine = db.get_engine()
-            
-            # Create a new connection with AUTOCOMMIT enabled
-            # This is the key change to ensure transactions are committed properly
-            with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as connection:
-                # Configure context with connection
-                context.configure(
-                    connection=connection,
-                    target_metadata=target_metadata,
-                    # Use transaction_per_migration for isolated changes
-                    transaction_per_migration=True
-                )
-
-                try:
-                    # Run migrations with additional error tracking
-                    start_time = time.time()
-                    logger.info("Starting migration execution")
-                    
-                    with context.begin_transaction():
-                        context.run_migrations()
-                    
-                    # Explicit commit after migrations
-                    connection.execute(text("COMMIT"))
-                    
-                    duration = time.time() - start_time
-                    logger.info(f"Migrations completed successfully in {duration:.2f} seconds")
-                except Exception as e:
-                    logger.error(f"Error during migrations: {e}")
-                    traceback.print_exc()
-                    # Try to commit what succeeded so far
-                    try:
-                        connection.execute(text("COMMIT"))
-                        logger.info("Committed successful migrations")
-                    except:
-                        pass
-                    raise
-                
-                # Success, break out of retry loop
-                return
-                
+            return await engine.connect()
         except Exception as e:
-            logger.error(f"Migration attempt {attempt+1}/{retries} failed: {e}")
-            traceback.print_exc()
+            logger.error(f"Connection attempt {attempt+1}/{retries} failed: {e}")
             
             if attempt < retries - 1:
-                wait_time = (attempt + 1) * 2  # Exponential backoff
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+                # Exponential base with random jitter so parallel deploys don't retry in lockstep;
+                # 0.1, 0.2, 0.4, 0.8, 1.6, 2.0 s bases wait about 5-10 s in total, enough for a cold database start
+                base = min(0.1 * (2 ** attempt), 2.0)
+                delay = random.uniform(base, base * 2)
+                logger.info(f"Retrying in {delay:.3f} seconds...")
+                await asyncio.sleep(delay)
             else:
-                logger.error("All migration attempts failed!")
+                logger.error("All connection attempts failed!")
                 raise
 
+
+async def run_async_migrations() -> None:
+    """Run migrations in 'online' mode on an async engine for the app's database."""
+    # Dedicated engine on the same URL; a one-shot migration run doesn't need the app's pool
+    engine = create_async_engine(db._with_driver(DB_URL, db.ASYNC_DRIVERS), poolclass=pool.NullPool)
+    
+    try:
+        connection = await connect_with_retry(engine)
+        try:
+            # Run migrations with additional error tracking
+            start_time = time.time()
+            logger.info("Starting migration execution")
+            
+            # Alembic commits each revision in its own transaction
+            await connection.run_sync(do_run_migrations)
+            
+            duration = time.time() - start_time
+            logger.info(f"Migrations completed successfully in {duration:.2f} seconds")
+        except Exception as e:
+            logger.error(f"Error during migrations: {e}")
+            traceback.print_exc()
+            raise
+        finally:
+            await connection.close()
+    finally:
+        # Release connections right away, even when connecting or migrating failed
+        await engine.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Normal CLI invocation: no loop yet, so own one for the migration run
+        asyncio.run(run_async_migrations())
+    else:
+        # Invoked from code that already runs an event loop (e.g. async startup hooks). That loop can't
+        # be re-entered, so run the migrations on a fresh loop in a worker thread and wait for them:
+        # the Alembic command must not return, and errors must not vanish, before they have finished.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, run_async_migrations()).result()
+
 if context.is_offline_mode():
     run_migrations_offline()
 else:
@@ -0,0 +1,47 @@
+"""add coverage rollup materialized view
+
+Revision ID: 0d7ff8d42068
+Revises: e7ded03c43dc
+Create Date: 2026-10-15 23:00:48.079380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d7ff8d42068'
+down_revision: Union[str, Sequence[str], None] = 'e7ded03c43dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Materialized views are Postgres-only; other backends keep computing coverage live.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Only completed days are rolled up; the endpoint scans guesses after the last day live.
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_coverage AS
+        SELECT COALESCE(user_id, 0) AS user_id, pronoun, tense, mood,
+               date_trunc('day', created_at) AS day,
+               COUNT(*) AS cnt
+        FROM guesses
+        WHERE user_answer IS NOT NULL
+          AND verb_id IS NOT NULL
+          AND created_at < date_trunc('day', now())
+        GROUP BY 1, 2, 3, 4, 5
+        WITH DATA
+    """)
+    # REFRESH ... CONCURRENTLY requires a unique index (anonymous guesses are rolled up as user 0).
+    op.execute("CREATE UNIQUE INDEX ux_mv_coverage_bin ON mv_coverage (user_id, pronoun, tense, mood, day)")
+    op.execute("CREATE INDEX ix_mv_coverage_mood_user_day ON mv_coverage (mood, user_id, day)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_coverage")
@@ -0,0 +1,43 @@
+"""backfill guesses skipped and make it not null
+
+Revision ID: 23f277ba63e2
+Revises: 5cb8a74c2c16
+Create Date: 2026-10-15 22:53:51.468270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23f277ba63e2'
+down_revision: Union[str, Sequence[str], None] = '5cb8a74c2c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Legacy rows only ever had skipped = True or NULL; NULL meant "not skipped"
+    op.execute("UPDATE guesses SET skipped = false WHERE skipped IS NULL")
+    # batch mode so SQLite can rebuild the table; on Postgres this is a plain ALTER COLUMN
+    with op.batch_alter_table('guesses') as batch_op:
+        batch_op.alter_column(
+            'skipped',
+            existing_type=sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('guesses') as batch_op:
+        batch_op.alter_column(
+            'skipped',
+            existing_type=sa.Boolean(),
+            nullable=True,
+            server_default=None,
+        )
@@ -0,0 +1,28 @@
+"""add index on verbs tubelex_rank
+
+Revision ID: 5cb8a74c2c16
+Revises: 4f4b898bf26b
+Create Date: 2026-10-15 22:51:10.552021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5cb8a74c2c16'
+down_revision: Union[str, Sequence[str], None] = '4f4b898bf26b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # get_verbs_by_class filters on tubelex_rank IS NOT NULL and orders by rank with a LIMIT
+    op.create_index('ix_verbs_tubelex_rank', 'verbs', ['tubelex_rank'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_verbs_tubelex_rank', table_name='verbs')
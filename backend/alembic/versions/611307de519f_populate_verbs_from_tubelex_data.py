@@ -6,12 +6,13 @@ Create Date: 2025-09-03 17:35:21.564371
 
 """
 from typing import Sequence, Union
-import os
+import logging
+import sys
 from pathlib import Path
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
 
 # revision identifiers, used by Alembic.
 revision: str = '611307de519f'
@@ -19,44 +20,90 @@ down_revision: Union[str, Sequence[str], None] = 'c8a1b429b45c'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+logger = logging.getLogger("alembic.runtime.migration")
+
+BACKEND_DIR = str(Path(__file__).resolve().parents[2])
+
+# Path to the TubeLex data file
+TUBELEX_FILE = Path(BACKEND_DIR) / "data" / "verbs-top500-from-tubelex.tsv"
+
+# Lightweight table definition so this migration doesn't depend on the current ORM models
+verbs_table = sa.table(
+    'verbs',
+    sa.column('infinitive', sa.String),
+    sa.column('tubelex_count', sa.Integer),
+    sa.column('tubelex_rank', sa.Integer),
+)
+
+
+def _import_utils():
+    """Make backend/ importable once, without piling up sys.path entries on repeated runs."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    import utils
+    return utils
+
+
+def _copy_tubelex_into_verbs(bind, utils) -> int:
+    """Postgres/asyncpg fast path: COPY the rows into a temp staging table, then merge in one statement."""
+    op.execute(
+        "CREATE TEMP TABLE verbs_staging "
+        "(infinitive VARCHAR(50), tubelex_count INTEGER, tubelex_rank INTEGER) ON COMMIT DROP"
+    )
+    total = 0
+
+    def records():
+        nonlocal total
+        for row in utils.iter_tubelex_verbs(str(TUBELEX_FILE)):
+            total += 1
+            yield (row['infinitive'], row['tubelex_count'], row['tubelex_rank'])
+
+    # Runs on the raw asyncpg connection, inside the transaction the migration already opened
+    await_only(bind.connection.driver_connection.copy_records_to_table(
+        'verbs_staging',
+        records=records(),
+        columns=['infinitive', 'tubelex_count', 'tubelex_rank'],
+    ))
+    op.execute(
+        "INSERT INTO verbs (infinitive, tubelex_count, tubelex_rank) "
+        "SELECT infinitive, tubelex_count, tubelex_rank FROM verbs_staging "
+        "ON CONFLICT (infinitive) DO UPDATE SET "
+        "tubelex_count = EXCLUDED.tubelex_count, tubelex_rank = EXCLUDED.tubelex_rank"
+    )
+    return total
+
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # Import our utility function
-    import sys
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from utils import populate_verbs_from_tubelex
-    
     # Get database connection from alembic
     bind = op.get_bind()
-    session = Session(bind=bind)
+    utils = _import_utils()
     
     try:
-        # Path to the TubeLex data file
-        data_dir = Path(__file__).parent.parent.parent / "data"
-        tubelex_file = data_dir / "verbs-top500-from-tubelex.tsv"
-        
-        if tubelex_file.exists():
-            print(f"Loading TubeLex verbs from: {tubelex_file}")
-            stats = populate_verbs_from_tubelex(session, str(tubelex_file))
-            print(f"Migration completed: {stats}")
+        if TUBELEX_FILE.exists():
+            logger.info("Loading TubeLex verbs from: %s", TUBELEX_FILE)
+            if bind.dialect.name == 'postgresql' and bind.dialect.driver == 'asyncpg':
+                total = _copy_tubelex_into_verbs(bind, utils)
+            else:
+                # Stream the file and upsert fixed-size chunks, all inside the migration's transaction
+                total = 0
+                for rows in utils.iter_chunks(utils.iter_tubelex_verbs(str(TUBELEX_FILE)), 500):
+                    bind.execute(utils.tubelex_upsert(verbs_table, rows, bind.dialect.name))
+                    total += len(rows)
+            logger.info("Migration completed: upserted %d verbs", total)
         else:
-            print(f"Warning: TubeLex file not found at {tubelex_file}")
+            logger.warning("TubeLex file not found at %s", TUBELEX_FILE)
     except Exception as e:
-        print(f"Error during TubeLex data population: {e}")
+        logger.error("Error during TubeLex data population: %s", e)
         raise
-    finally:
-        session.close()
 
 
 def downgrade() -> None:
     """Downgrade schema."""
     # Remove TubeLex data from verbs
-    bind = op.get_bind()
-    
-    # Update all verbs to clear tubelex_count and tubelex_rank
-    op.execute(
-        "UPDATE verbs SET tubelex_count = NULL, tubelex_rank = NULL WHERE tubelex_count IS NOT NULL OR tubelex_rank IS NOT NULL"
-    )
+    # Clear tubelex_count and tubelex_rank separately; each filter can use its own index,
+    # which the OR form would prevent
+    op.execute("UPDATE verbs SET tubelex_count = NULL WHERE tubelex_count IS NOT NULL")
+    op.execute("UPDATE verbs SET tubelex_rank = NULL WHERE tubelex_rank IS NOT NULL")
     
-    print("Cleared TubeLex data from verbs table")
+    logger.info("Cleared TubeLex data from verbs table")
@@ -9,7 +9,6 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '6fcd840b7647'
@@ -64,11 +63,13 @@ def downgrade() -> None:
     op.create_table('questions',
     sa.Column('id', sa.INTEGER(), autoincrement=True, nullable=False),
     sa.Column('pronoun', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('tense', postgresql.ENUM('present', 'imperfect', 'preterite', 'future', 'present_perfect', 'past_anterior', 'future_perfect', 'conditional_simple', name='tenseenum'), autoincrement=False, nullable=False),
+    sa.Column('tense', sa.String(32), autoincrement=False, nullable=False),
     sa.Column('answer', sa.VARCHAR(), autoincrement=False, nullable=False),
     sa.Column('verb', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('mood', postgresql.ENUM('conditional', 'imperative', 'indicative', 'subjunctive', name='moodenum'), autoincrement=False, nullable=False),
-    sa.PrimaryKeyConstraint('id', name=op.f('questions_pkey'))
+    sa.Column('mood', sa.String(32), autoincrement=False, nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('questions_pkey')),
+    sa.CheckConstraint("tense IN ('present', 'imperfect', 'preterite', 'future', 'present_perfect', 'past_anterior', 'future_perfect', 'conditional_simple')", name='ck_questions_tense'),
+    sa.CheckConstraint("mood IN ('conditional', 'imperative', 'indicative', 'subjunctive')", name='ck_questions_mood')
     )
     op.drop_table('guesses')
     op.drop_table('verbs')
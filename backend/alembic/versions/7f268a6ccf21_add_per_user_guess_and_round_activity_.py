@@ -0,0 +1,36 @@
+"""add per-user guess and round activity indexes
+
+Revision ID: 7f268a6ccf21
+Revises: a862b933b538
+Create Date: 2026-10-15 23:08:03.309133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f268a6ccf21'
+down_revision: Union[str, Sequence[str], None] = 'a862b933b538'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-user coverage filters on user_id and groups by (pronoun, tense, mood)
+    op.create_index('ix_guesses_user_pronoun_tense_mood', 'guesses', ['user_id', 'pronoun', 'tense', 'mood'])
+    # Round activity only counts completed rounds, so the index skips open ones
+    op.create_index(
+        'ix_rounds_user_ended', 'rounds', ['user_id', 'ended_at'],
+        postgresql_where=sa.text('ended_at IS NOT NULL'),
+        sqlite_where=sa.text('ended_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rounds_user_ended', table_name='rounds')
+    op.drop_index('ix_guesses_user_pronoun_tense_mood', table_name='guesses')
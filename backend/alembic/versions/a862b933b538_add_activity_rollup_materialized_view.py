@@ -0,0 +1,51 @@
+"""add activity rollup materialized view
+
+Revision ID: a862b933b538
+Revises: 0d7ff8d42068
+Create Date: 2026-10-15 23:03:57.210211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a862b933b538'
+down_revision: Union[str, Sequence[str], None] = '0d7ff8d42068'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres-only, like mv_coverage; other backends keep computing activity live.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Completed days only; the activity endpoint scans rows after the last day live.
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_activity_daily AS
+        SELECT 'questions'::text AS metric, COALESCE(user_id, 0) AS user_id,
+               date_trunc('day', created_at) AS day, COUNT(*) AS cnt
+        FROM guesses
+        WHERE user_answer IS NOT NULL
+          AND created_at < date_trunc('day', now())
+        GROUP BY 1, 2, 3
+        UNION ALL
+        SELECT 'rounds'::text AS metric, COALESCE(user_id, 0) AS user_id,
+               date_trunc('day', ended_at) AS day, COUNT(*) AS cnt
+        FROM rounds
+        WHERE ended_at IS NOT NULL
+          AND ended_at < date_trunc('day', now())
+        GROUP BY 1, 2, 3
+        WITH DATA
+    """)
+    # Unique index required by REFRESH ... CONCURRENTLY; also serves the (metric, user_id, day) lookups.
+    op.execute("CREATE UNIQUE INDEX ux_mv_activity_daily ON mv_activity_daily (metric, user_id, day)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_activity_daily")
@@ -31,16 +31,23 @@ class MoodEnum(enum.Enum):
     indicative = "indicative"
     subjunctive = "subjunctive"
 
+def _in_check(column, enum_cls):
+    # Plain strings + CHECK instead of native enum types, so adding a value is a constraint swap
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return sa.CheckConstraint(f"{column} IN ({values})", name=f"ck_questions_{column}")
+
 def upgrade():
     op.create_table(
         'questions',
         sa.Column('id', sa.Integer(), nullable=False),
         sa.Column('pronoun', sa.String(), nullable=False),
-        sa.Column('tense', sa.Enum(TenseEnum), nullable=False),
+        sa.Column('tense', sa.String(32), nullable=False),
         sa.Column('answer', sa.String(), nullable=False),
         sa.Column('verb', sa.String(), nullable=False),
-        sa.Column('mood', sa.Enum(MoodEnum), nullable=False),
-        sa.PrimaryKeyConstraint('id')
+        sa.Column('mood', sa.String(32), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        _in_check('tense', TenseEnum),
+        _in_check('mood', MoodEnum),
     )
 
 def downgrade():
@@ -0,0 +1,37 @@
+"""add partial index for active rounds
+
+Revision ID: bfe36aec2480
+Revises: 7f268a6ccf21
+Create Date: 2026-10-15 23:17:03.211589
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bfe36aec2480'
+down_revision: Union[str, Sequence[str], None] = '7f268a6ccf21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /rounds/active is polled; open rounds are at most a handful per user, so this index stays tiny.
+    # Built outside the migration transaction so Postgres can build it without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_rounds_user_active', 'rounds', ['user_id', 'started_at'],
+            postgresql_where=sa.text('ended_at IS NULL'),
+            sqlite_where=sa.text('ended_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_rounds_user_active', table_name='rounds', postgresql_concurrently=True)
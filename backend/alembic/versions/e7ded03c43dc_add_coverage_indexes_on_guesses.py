@@ -0,0 +1,31 @@
+"""add coverage indexes on guesses
+
+Revision ID: e7ded03c43dc
+Revises: 23f277ba63e2
+Create Date: 2026-10-15 22:56:40.297277
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7ded03c43dc'
+down_revision: Union[str, Sequence[str], None] = '23f277ba63e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Coverage filters on mood and groups by (pronoun, tense, mood); created_at serves the date range
+    op.create_index('ix_guesses_mood_tense_pronoun_created', 'guesses', ['mood', 'tense', 'pronoun', 'created_at'])
+    # Per-user metrics filter on user_id and a created_at range
+    op.create_index('ix_guesses_user_created', 'guesses', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_guesses_user_created', table_name='guesses')
+    op.drop_index('ix_guesses_mood_tense_pronoun_created', table_name='guesses')
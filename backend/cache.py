@@ -0,0 +1,40 @@
+"""In-process caching helpers shared by the routers"""
+
+import time
+from typing import Any, Dict
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire `ttl` seconds after being set.
+
+    Bounded to `maxsize` entries; the oldest entry is evicted first.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Any, tuple] = {}
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def discard_where(self, predicate) -> None:
+        """Drop every entry whose key satisfies `predicate`."""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
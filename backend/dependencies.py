@@ -1,10 +1,15 @@
 from fastapi import HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from spanishconjugator import Conjugator
-from services import QuestionService, VerbService, create_question_service, create_verb_service
+from services import (
+    QuestionService, RoundService, VerbService,
+    create_question_service, create_round_service, create_verb_service,
+)
 from db import get_db
 
-def get_conjugator() -> Conjugator:
+# Dependencies are async so FastAPI resolves them on the event loop instead of a threadpool hop each.
+# The conjugator is set once at startup, so there is no lazy initialization to guard.
+async def get_conjugator() -> Conjugator:
     """Get conjugator instance from app state"""
     # This will be set during app startup
     if not hasattr(get_conjugator, '_conjugator'):
@@ -15,16 +20,23 @@ def set_conjugator(conjugator: Conjugator):
     """Set the conjugator instance (called from main.py on startup)"""
     get_conjugator._conjugator = conjugator
 
-def get_question_service(
+async def get_question_service(
     conjugator: Conjugator = Depends(get_conjugator),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> QuestionService:
     """Get question service instance with conjugator and database dependencies"""
     return create_question_service(conjugator, db)
 
-def get_verb_service(
+async def get_verb_service(
     conjugator: Conjugator = Depends(get_conjugator),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> VerbService:
     """Get verb service instance with conjugator and database dependencies"""
     return create_verb_service(conjugator, db)
+
+async def get_round_service(
+    question_service: QuestionService = Depends(get_question_service),
+    db: AsyncSession = Depends(get_db)
+) -> RoundService:
+    """Get round service instance sharing the request's question service and database session"""
+    return create_round_service(question_service, db)
@@ -1,35 +1,58 @@
-from dotenv import load_dotenv
-load_dotenv()
-
 from fastapi import FastAPI, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
 import os
-import psycopg2
 
 from db import get_db, get_engine
 from models import Base
-from spanishconjugator import Conjugator
+from services import CONJUGATOR
 from dependencies import set_conjugator
 
 # Import routers
 from routers import questions, rounds, metrics, verbs
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
+
+METRICS_ROLLUP_REFRESH_SECONDS = int(os.getenv("METRICS_ROLLUP_REFRESH_SECONDS", "86400"))
+
+
+async def _refresh_metrics_rollups_periodically(engine):
+    while True:
+        await asyncio.sleep(METRICS_ROLLUP_REFRESH_SECONDS)
+        try:
+            await metrics.refresh_metrics_rollups(engine)
+        except SQLAlchemyError:
+            logger.exception("Metrics rollup refresh failed")
 
 # Create tables and initialize services on startup
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     # Create database tables
     engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     
     # Initialize conjugator
-    conjugator = Conjugator()
-    set_conjugator(conjugator)
+    set_conjugator(CONJUGATOR)
+
+    # The metrics rollups only exist on Postgres (see migrations 0d7ff8d42068 and a862b933b538)
+    if engine.dialect.name == "postgresql":
+        app.state.rollup_refresh_task = asyncio.create_task(_refresh_metrics_rollups_periodically(engine))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    task = getattr(app.state, "rollup_refresh_task", None)
+    if task is not None:
+        task.cancel()
 
 # Allow CORS for local frontend development
 app.add_middleware(
@@ -51,14 +74,18 @@ class HealthResponse(BaseModel):
     db: str
 
 
-# Health check endpoint
+# Bounds the whole probe (pool checkout, connect and query) so a down or saturated database
+# answers 503 within a load balancer's probe deadline instead of hanging on the pool/connect timeouts
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+
+
+# Health check endpoint - pings through the engine's pool instead of opening a new connection
 @app.get("/health", response_model=HealthResponse)
-def health_check():
+async def health_check(db: AsyncSession = Depends(get_db)):
     db_status = "ok"
     try:
-        conn = psycopg2.connect(os.getenv("DATABASE_URL"), connect_timeout=2)
-        conn.close()
-    except Exception:
+        await asyncio.wait_for(db.execute(text("SELECT 1")), HEALTH_CHECK_TIMEOUT_SECONDS)
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError):
         db_status = "error"
         return JSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey, Text, func, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey, Text, func, Enum, false, Index, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import table, column
 from sqlalchemy.ext.declarative import declarative_base
 import enum
 
@@ -40,12 +41,26 @@ class Verb(Base):
     infinitive = Column(String(50), unique=True, nullable=False)
     definition = Column(Text)
     tubelex_count = Column(Integer, nullable=True)
-    tubelex_rank = Column(Integer, nullable=True)
+    tubelex_rank = Column(Integer, nullable=True, index=True)
 
     guesses = relationship("Guess", back_populates="verb")
 
 class Round(Base):
     __tablename__ = "rounds"
+    __table_args__ = (
+        # Partial: activity only counts completed rounds
+        Index(
+            'ix_rounds_user_ended', 'user_id', 'ended_at',
+            postgresql_where=text('ended_at IS NOT NULL'),
+            sqlite_where=text('ended_at IS NOT NULL'),
+        ),
+        # Partial: /rounds/active looks up the newest open round per user
+        Index(
+            'ix_rounds_user_active', 'user_id', 'started_at',
+            postgresql_where=text('ended_at IS NULL'),
+            sqlite_where=text('ended_at IS NULL'),
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=True)
@@ -62,6 +77,11 @@ class Guess(Base):
     This model encapsulates both the dynamically question that the user sees and their eventual response. 
     """
     __tablename__ = "guesses"
+    __table_args__ = (
+        Index('ix_guesses_mood_tense_pronoun_created', 'mood', 'tense', 'pronoun', 'created_at'),
+        Index('ix_guesses_user_created', 'user_id', 'created_at'),
+        Index('ix_guesses_user_pronoun_tense_mood', 'user_id', 'pronoun', 'tense', 'mood'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=True)  # For mode without rounds (rounds also belongs to users)
@@ -69,18 +89,41 @@ class Guess(Base):
     verb_id = Column(Integer, ForeignKey("verbs.id"))
     
     # Question parameters
-    pronoun = Column(Enum(PronounEnum), nullable=False)
-    tense = Column(Enum(TenseEnum), nullable=False)
-    mood = Column(Enum(MoodEnum), nullable=False)
+    # Stored as plain strings (matching the migrations), not native database enum types
+    pronoun = Column(Enum(PronounEnum, native_enum=False, length=20), nullable=False)
+    tense = Column(Enum(TenseEnum, native_enum=False, length=50), nullable=False)
+    mood = Column(Enum(MoodEnum, native_enum=False, length=50), nullable=False)
     
     # User response
     user_answer = Column(String(100), nullable=True)
     correct_answer = Column(String(100), nullable=False)
     is_correct = Column(Boolean, nullable=True)
-    skipped = Column(Boolean, nullable=True)
+    skipped = Column(Boolean, nullable=False, default=False, server_default=false())
     irregular = Column(Boolean, nullable=True, default=None)
     
     created_at = Column(DateTime, default=func.now())
     
     round = relationship("Round", back_populates="guesses")
     verb = relationship("Verb", back_populates="guesses")
+
+
+# Daily coverage rollup (Postgres materialized view created by migration 0d7ff8d42068).
+# Declared as a lightweight table so Base.metadata.create_all never tries to create it.
+coverage_rollup = table(
+    "mv_coverage",
+    column("user_id", Integer),
+    column("pronoun", String),
+    column("tense", String),
+    column("mood", String),
+    column("day", DateTime),
+    column("cnt", Integer),
+)
+
+# Daily answered-question and completed-round counts (Postgres materialized view, migration a862b933b538)
+activity_rollup = table(
+    "mv_activity_daily",
+    column("metric", String),
+    column("user_id", Integer),
+    column("day", DateTime),
+    column("cnt", Integer),
+)
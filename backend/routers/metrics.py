@@ -1,45 +1,208 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text, Integer, String
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import cast, func, select, text, Integer, String, literal, literal_column, union_all
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+import asyncio
 import calendar
+import orjson
+from functools import lru_cache
+import os
 
-from db import get_db
-from models import Guess, Round, MoodEnum, TenseEnum, PronounEnum, Verb
+from db import get_db, get_sessionmaker
+from models import Guess, Round, MoodEnum, TenseEnum, PronounEnum, coverage_rollup, activity_rollup
+from cache import TTLCache
+from services import cached_conjugation
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
 
-def get_date_format_func(db: Session, date_column, format_str: str):
+# (dialect, format) -> date formatting expression builder for the formats the endpoints use
+_DATE_FORMATS = {
+    ('postgresql', '%Y-%m-%d'): lambda column: func.to_char(column, 'YYYY-MM-DD'),
+    ('postgresql', '%Y-%m'): lambda column: func.to_char(column, 'YYYY-MM'),
+    ('postgresql', '%Y-%m-01'): lambda column: func.to_char(column, 'YYYY-MM-01'),
+    ('sqlite', '%Y-%m-%d'): lambda column: func.strftime('%Y-%m-%d', column),
+    ('sqlite', '%Y-%m'): lambda column: func.strftime('%Y-%m', column),
+    ('sqlite', '%Y-%m-01'): lambda column: func.strftime('%Y-%m-01', column),
+}
+
+
+def get_date_format_func(db: AsyncSession, date_column, format_str: str):
     """
     Get database-specific date formatting function.
     
     Args:
         db: Database session
         date_column: SQLAlchemy column to format
-        format_str: Format string ('%Y-%m-%d' or '%Y-%m')
+        format_str: strftime-style format string ('%Y-%m-%d', '%Y-%m', ...)
     
     Returns:
         SQLAlchemy function for date formatting
     """
     engine_name = db.bind.dialect.name
+    builder = _DATE_FORMATS.get((engine_name, format_str))
+    if builder is not None:
+        return builder(date_column)
     
     if engine_name == 'postgresql':
         # PostgreSQL uses to_char() for date formatting
-        if format_str == '%Y-%m-%d':
-            return func.to_char(date_column, 'YYYY-MM-DD')
-        elif format_str == '%Y-%m':
-            return func.to_char(date_column, 'YYYY-MM')
-        else:
-            # Fallback for other formats
-            return func.to_char(date_column, format_str.replace('%Y', 'YYYY').replace('%m', 'MM').replace('%d', 'DD'))
+        return func.to_char(date_column, format_str.replace('%Y', 'YYYY').replace('%m', 'MM').replace('%d', 'DD'))
+    # SQLite and other databases use strftime()
+    return func.strftime(format_str, date_column)
+
+
+# Dashboard responses change slowly, so they are served from a per-process cache for a few minutes
+METRICS_CACHE_TTL = int(os.getenv("METRICS_CACHE_TTL", "300"))
+_metrics_cache = TTLCache(ttl=METRICS_CACHE_TTL)
+
+
+# Activity streams share one recomputed series per (metric, period, user_id) for a few seconds,
+# however many clients are subscribed to it
+STREAM_REFRESH_SECONDS = int(os.getenv("STREAM_REFRESH_SECONDS", "5"))
+_stream_cache = TTLCache(ttl=STREAM_REFRESH_SECONDS)
+_stream_refreshes: Dict[tuple, "asyncio.Future"] = {}
+
+
+def invalidate_user_metrics(user_id: Optional[int]) -> None:
+    """Drop cached metrics a write by `user_id` can change: that user's and the all-users aggregates.
+
+    Every cache key is (kind, user_id, ...). Writes in other workers are only picked up on expiry.
+    """
+    for cache in (_metrics_cache, _stream_cache):
+        cache.discard_where(lambda key: key[1] is None or key[1] == user_id)
+
+
+@lru_cache(maxsize=256)
+def _mood_enums(moods: tuple) -> tuple:
+    """MoodEnum members for a mood filter; raises ValueError on an unknown mood (errors are not cached)."""
+    return tuple(MoodEnum(m) for m in moods)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO timestamp query parameter; dashboards poll with the same strings, so results are memoized."""
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _is_day_aligned(value: Optional[datetime]) -> bool:
+    return value is None or (value.hour, value.minute, value.second, value.microsecond) == (0, 0, 0, 0)
+
+
+ROLLUP_VIEWS = ("mv_coverage", "mv_activity_daily")
+_rollup_present: Set[str] = set()
+
+
+async def _rollup_exists(db: AsyncSession, name: str) -> bool:
+    """Rollup views are created by migrations, so databases built with create_all don't have them.
+
+    Only a positive answer is remembered, so a view created by a later migration is picked up.
+    """
+    if name not in _rollup_present:
+        if not await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+            return False
+        _rollup_present.add(name)
+    return True
+
+
+async def refresh_metrics_rollups(engine) -> None:
+    """Refresh the metrics rollups; with several workers only the one holding the advisory lock refreshes."""
+    async with engine.begin() as conn:
+        if await conn.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext('metrics_rollups'))")):
+            for name in ROLLUP_VIEWS:
+                await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+
+
+def _rollup_end(rollup):
+    """First instant not covered by a daily rollup (-infinity while it is empty)."""
+    last_day = select(func.max(rollup.c.day) + literal_column("interval '1 day'")).scalar_subquery()
+    return func.coalesce(last_day, literal_column("'-infinity'::timestamp"))
+
+
+def _activity_counts(metric: str, user_id: Optional[int], overall_start, overall_end, use_rollup: bool):
+    """(ts, cnt) rows for the activity metric: the daily rollup plus a live scan of rows newer than its last day."""
+    if metric == "questions":
+        ts_column = Guess.created_at
+        live = select(ts_column.label('ts'), literal_column('1').label('cnt')).filter(Guess.user_answer.isnot(None))
+        if user_id:
+            live = live.filter(Guess.user_id == user_id)
+    else:
+        ts_column = Round.ended_at
+        live = select(ts_column.label('ts'), literal_column('1').label('cnt')).filter(Round.ended_at.isnot(None))
+        if user_id:
+            live = live.filter(Round.user_id == user_id)
+    live = live.filter(ts_column >= overall_start, ts_column < overall_end)
+    if not use_rollup:
+        return live.subquery()
+    live = live.filter(ts_column >= _rollup_end(activity_rollup))
+    rolled = select(
+        activity_rollup.c.day.label('ts'),
+        activity_rollup.c.cnt.label('cnt')
+    ).filter(
+        activity_rollup.c.metric == metric,
+        activity_rollup.c.day >= overall_start,
+        activity_rollup.c.day < overall_end
+    )
+    if user_id:
+        rolled = rolled.filter(activity_rollup.c.user_id == user_id)
+    return union_all(rolled, live).subquery()
+
+
+# period -> (bucket unit, number of buckets, label format, unit rows are keyed by).
+# A None label format numbers the buckets "Week N". Year rows keep their week-start keys,
+# so only a week starting on the 1st lands in a month bucket, as in the row-by-row version.
+ACTIVITY_BUCKETS = {
+    "week": ("day", 7, "Dy", "day"),
+    "month": ("week", 4, None, "week"),
+    "year": ("month", 12, "Mon", "week"),
+}
+
+
+async def _activity_series_postgres(db: AsyncSession, metric: str, period: str, user_id: Optional[int]) -> Dict[str, Any]:
+    """Bucket generation, zero-fill and totals in one query via generate_series."""
+    unit, count, label_format, key_unit = ACTIVITY_BUCKETS[period]
+    step = literal_column(f"interval '1 {unit}'")
+    last = func.date_trunc(unit, func.timezone('UTC', func.now()))
+    first = last - literal_column(f"interval '{count - 1} {unit}s'")
+    counts_source = _activity_counts(
+        metric, user_id, first, last + step,
+        use_rollup=await _rollup_exists(db, 'mv_activity_daily')
+    )
+    bucket_of = func.date_trunc(key_unit, counts_source.c.ts)
+    counts = select(
+        bucket_of.label('bucket'),
+        func.sum(counts_source.c.cnt).label('value')
+    ).group_by(bucket_of).subquery('counts')
+    buckets = select(func.generate_series(first, last, step).label('bucket')).subquery('buckets')
+    value = func.coalesce(counts.c.value, 0)
+    if label_format:
+        label = func.to_char(buckets.c.bucket, label_format)
     else:
-        # SQLite and other databases use strftime()
-        return func.strftime(format_str, date_column)
+        label = literal('Week ') + cast(func.row_number().over(order_by=buckets.c.bucket), String)
+    rows = (await db.execute(
+        select(
+            func.to_char(buckets.c.bucket, 'YYYY-MM-DD').label('date'),
+            label.label('label'),
+            value.label('value'),
+            func.sum(value).over().label('total'),
+        ).select_from(
+            buckets.outerjoin(counts, counts.c.bucket == buckets.c.bucket)
+        ).order_by(buckets.c.bucket)
+    )).all()
+    total = int(rows[0].total) if rows else 0
+    return {
+        "metric": metric,
+        "period": period,
+        "data": [{"date": row.date, "value": int(row.value), "label": row.label} for row in rows],
+        "total": total,
+        "average": round(total / count, 1),
+    }
 
 
 class CoverageMetadata(BaseModel):
@@ -77,11 +240,11 @@ class ActivityResponse(BaseModel):
 
 @router.get("/coverage", response_model=CoverageResponse)
 async def get_coverage_metrics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     mood: Optional[List[str]] = Query(None, description="Filter by specific mood(s)"),
     user_id: Optional[int] = Query(None, description="Filter by user (optional)"),
     start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
-    end_date: Optional[str] = Query(None, description="End date (ISO format)"),
+    end_date: Optional[str] = Query(None, description="End date (ISO format, exclusive)"),
     min_questions: int = Query(1, description="Only include bins with at least N questions")
 ):
     """
@@ -90,90 +253,181 @@ async def get_coverage_metrics(
     Returns the distribution of questions across different pronoun/tense/mood combinations,
     helping identify practice patterns and gaps in coverage.
     """
-    
-    # Start with base query - only count answered questions
-    query = db.query(
-        Guess.pronoun,
-        Guess.tense, 
-        Guess.mood,
-        func.count(Guess.id).label('question_count')
-    ).join(Verb, Guess.verb_id == Verb.id).filter(
-        Guess.user_answer.isnot(None)  # Only include answered questions
-    )
+    return ORJSONResponse(await _coverage_payload(db, mood, user_id, start_date, end_date, min_questions))
+
+
+async def _coverage_payload(
+    db: AsyncSession,
+    mood: Optional[List[str]],
+    user_id: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    min_questions: int
+) -> Dict[str, Any]:
+    """Coverage response body (CoverageResponse shape) for the given filters."""
+    # Only the dashboard shape (no explicit date window) is cached; keys include user_id so users never share entries
+    cache_key = None
+    if not start_date and not end_date:
+        cache_key = ("coverage", user_id, tuple(mood) if mood else None, min_questions)
+        cached = _metrics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    # Only count answered questions
+    filters = [
+        Guess.user_answer.isnot(None),
+        Guess.verb_id.isnot(None)  # Same rows the old join to verbs kept, without probing verbs
+    ]
+    rollup_filters = []
     
     # Apply filters
     if mood:
         try:
-            mood_enums = [MoodEnum(m) for m in mood]
-            query = query.filter(Guess.mood.in_(mood_enums))
+            mood_enums = _mood_enums(tuple(mood))
+            filters.append(Guess.mood.in_(mood_enums))
+            rollup_filters.append(coverage_rollup.c.mood.in_([m.value for m in mood_enums]))
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Invalid mood in list: {mood}")
     
     if user_id:
-        query = query.filter(Guess.user_id == user_id)
+        filters.append(Guess.user_id == user_id)
+        rollup_filters.append(coverage_rollup.c.user_id == user_id)
     
+    start_dt = end_dt = None
     if start_date:
         try:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            query = query.filter(Guess.created_at >= start_dt)
+            start_dt = _parse_iso_datetime(start_date)
+            filters.append(Guess.created_at >= start_dt)
+            rollup_filters.append(coverage_rollup.c.day >= start_dt)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid start_date format")
     
     if end_date:
         try:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            query = query.filter(Guess.created_at <= end_dt)
+            end_dt = _parse_iso_datetime(end_date)
+            filters.append(Guess.created_at < end_dt)
+            rollup_filters.append(coverage_rollup.c.day < end_dt)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format")
     
-    # Group by pronoun, tense, mood
-    query = query.group_by(Guess.pronoun, Guess.tense, Guess.mood)
-    
-    # Apply minimum questions filter
-    query = query.having(func.count(Guess.id) >= min_questions)
-    
-    # Order by question count descending
-    query = query.order_by(func.count(Guess.id).desc())
-    
-    results = query.all()
-    
-    # Calculate metadata
-    total_questions = sum(row.question_count for row in results)
-    unique_bins = len(results)
-    
-    # Process bins
-    bins = []
-    for row in results:
-        bins.append(CoverageBin(
-            pronoun=row.pronoun.value,
-            tense=row.tense.value,
-            mood=row.mood.value,
-            question_count=row.question_count
-        ))
-    
-    # Build metadata
-    metadata = CoverageMetadata(
-        total_questions=total_questions,
-        unique_bins=unique_bins,
-        mood_filter=mood if mood else None
-    )
+    if (
+        db.bind.dialect.name == 'postgresql'
+        and _is_day_aligned(start_dt) and _is_day_aligned(end_dt)
+        and await _rollup_exists(db, 'mv_coverage')
+    ):
+        # Whole days come from the daily rollup; only guesses after its last day are scanned live
+        live = select(
+            Guess.pronoun,
+            Guess.tense,
+            Guess.mood,
+            func.count(Guess.id).label('question_count')
+        ).filter(
+            *filters,
+            Guess.created_at >= _rollup_end(coverage_rollup)
+        ).group_by(Guess.pronoun, Guess.tense, Guess.mood)
+        rolled = select(
+            coverage_rollup.c.pronoun,
+            coverage_rollup.c.tense,
+            coverage_rollup.c.mood,
+            coverage_rollup.c.cnt.label('question_count')
+        ).filter(*rollup_filters)
+        combined = union_all(live, rolled).subquery()
+        query = select(
+            combined.c.pronoun,
+            combined.c.tense,
+            combined.c.mood,
+            func.sum(combined.c.question_count).label('question_count')
+        ).group_by(
+            combined.c.pronoun, combined.c.tense, combined.c.mood
+        ).having(func.sum(combined.c.question_count) >= min_questions)
+    else:
+        query = select(
+            Guess.pronoun,
+            Guess.tense, 
+            Guess.mood,
+            func.count(Guess.id).label('question_count')
+        ).filter(*filters)
+        
+        # Group by pronoun, tense, mood
+        query = query.group_by(Guess.pronoun, Guess.tense, Guess.mood)
+        
+        # Apply minimum questions filter
+        query = query.having(func.count(Guess.id) >= min_questions)
     
+    date_range = None
     if start_date or end_date:
-        metadata.date_range = {}
+        date_range = {}
         if start_date:
-            metadata.date_range["start_date"] = start_date
+            date_range["start_date"] = start_date
         if end_date:
-            metadata.date_range["end_date"] = end_date
-    
-    return CoverageResponse(
-        metadata=metadata,
-        bins=bins
-    )
+            date_range["end_date"] = end_date
+    
+    if db.bind.dialect.name == 'postgresql':
+        # Postgres shapes the bins into one JSON row, so no per-row model objects are built here
+        grouped = query.subquery()
+        bin_json = func.jsonb_build_object(
+            'pronoun', grouped.c.pronoun,
+            'tense', grouped.c.tense,
+            'mood', grouped.c.mood,
+            'question_count', grouped.c.question_count,
+        )
+        summary = (await db.execute(select(
+            func.coalesce(func.sum(grouped.c.question_count), 0).label('total_questions'),
+            func.count().label('unique_bins'),
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(bin_json, grouped.c.question_count.desc())),
+                literal([], JSONB),
+                type_=JSONB,
+            ).label('bins'),
+        ))).one()
+        payload = {
+            "metadata": {
+                "total_questions": int(summary.total_questions),
+                "unique_bins": summary.unique_bins,
+                "mood_filter": mood if mood else None,
+                "date_range": date_range,
+            },
+            "bins": summary.bins,
+        }
+        if cache_key is not None:
+            _metrics_cache.set(cache_key, payload)
+        return payload
+    
+    # Order by question count descending; the grand total rides along on every row as a window sum
+    query = query.add_columns(
+        func.sum(func.count(Guess.id)).over().label('grand_total')
+    ).order_by(func.count(Guess.id).desc())
+    
+    # Build bins in one pass over a streamed result
+    bins = []
+    total_questions = 0
+    async for row in await db.stream(query.execution_options(yield_per=500)):
+        bins.append({
+            'pronoun': row.pronoun.value,
+            'tense': row.tense.value,
+            'mood': row.mood.value,
+            'question_count': row.question_count
+        })
+        total_questions = row.grand_total
+    
+    # Plain dicts in the shape of CoverageResponse; the rows are already typed, so no per-bin validation
+    payload = {
+        "metadata": {
+            "total_questions": total_questions,
+            "unique_bins": len(bins),
+            "mood_filter": mood if mood else None,
+            "date_range": date_range,
+        },
+        "bins": bins,
+    }
+    if cache_key is not None:
+        _metrics_cache.set(cache_key, payload)
+    return payload
 
 
 @router.get("/activity", response_model=ActivityResponse)
 async def get_practice_activity(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     metric: str = Query("questions", description="Metric to track: 'questions' or 'rounds'"),
     period: str = Query("week", description="Time period: 'week' (days), 'month' (weeks), or 'year' (months)"),
     user_id: Optional[int] = Query(None, description="Filter by user (optional)")
@@ -187,13 +441,35 @@ async def get_practice_activity(
     - period='month': Last 4 weeks, binned by week
     - period='year': Last 12 months, binned by month
     """
-    
-    # Validate parameters
+    return ORJSONResponse(await _activity_payload(db, metric, period, user_id))
+
+
+def _validate_activity_params(metric: str, period: str) -> None:
     if metric not in ["questions", "rounds"]:
         raise HTTPException(status_code=400, detail="metric must be 'questions' or 'rounds'")
     
     if period not in ["week", "month", "year"]:
         raise HTTPException(status_code=400, detail="period must be 'week', 'month', or 'year'")
+
+
+async def _activity_payload(
+    db: AsyncSession, metric: str, period: str, user_id: Optional[int], use_cache: bool = True
+) -> Dict[str, Any]:
+    """Activity response body (ActivityResponse shape) for the given metric and period.
+    
+    With use_cache=False the series is always recomputed; the fresh result still refreshes the cache.
+    """
+    _validate_activity_params(metric, period)
+    
+    cache_key = ("activity", user_id, metric, period)
+    cached = _metrics_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        return cached
+    
+    if db.bind.dialect.name == 'postgresql':
+        payload = await _activity_series_postgres(db, metric, period, user_id)
+        _metrics_cache.set(cache_key, payload)
+        return payload
     
     # Calculate date range and binning
     now = datetime.utcnow()
@@ -208,7 +484,7 @@ async def get_practice_activity(
             day = start_date + timedelta(days=i)
             periods.append({
                 'date': day.strftime(date_format),
-                'label': day.strftime("%a"),  # Mon, Tue, etc
+                'label': calendar.day_abbr[day.weekday()],  # Mon, Tue, etc
                 'start': day,
                 'end': day + timedelta(days=1)
             })
@@ -235,135 +511,158 @@ async def get_practice_activity(
         # Last 12 months, binned by month
         current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
+        month_index = current_month_start.year * 12 + current_month_start.month - 1
+        
         periods = []
-        for i in range(12):
-            # Go back i months from current month
-            if current_month_start.month > i:
-                month_start = current_month_start.replace(month=current_month_start.month - i)
-            else:
-                year_offset = (i - current_month_start.month) // 12 + 1
-                month_num = 12 - ((i - current_month_start.month) % 12)
-                month_start = current_month_start.replace(year=current_month_start.year - year_offset, month=month_num)
-            
-            # Calculate month end
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1)
-            
-            periods.insert(0, {  # Insert at beginning to maintain chronological order
+        for i in range(11, -1, -1):  # Oldest month first
+            year, month = divmod(month_index - i, 12)
+            month_start = current_month_start.replace(year=year, month=month + 1)
+            next_year, next_month = divmod(month_index - i + 1, 12)
+            periods.append({
                 'date': month_start.strftime("%Y-%m-%d"),
-                'label': month_start.strftime("%b"),  # Jan, Feb, etc
+                'label': calendar.month_abbr[month_start.month],  # Jan, Feb, etc
                 'start': month_start,
-                'end': month_end
+                'end': month_start.replace(year=next_year, month=next_month + 1)
             })
     
-    # Query data based on metric type
-    if metric == "questions":
-        # Count answered questions only (guesses with user_answer)
-        if period == "week":
-            # For week view, group by day
-            date_format = get_date_format_func(db, Guess.created_at, '%Y-%m-%d')
-            query = db.query(
-                date_format.label('period_date'),
-                func.count(Guess.id).label('count')
-            )
-        else:  # month view - group by week start (Monday)
-            # For monthly view, group by the Monday of each week
-            if db.bind.dialect.name == 'postgresql':
-                week_start = func.date_trunc('week', Guess.created_at)
-                date_format = func.to_char(week_start, 'YYYY-MM-DD')
-            else:
-                # SQLite: Use a simpler approach - just group by day for now
-                date_format = get_date_format_func(db, Guess.created_at, '%Y-%m-%d')
-            
-            query = db.query(
-                date_format.label('period_date'),
-                func.count(Guess.id).label('count')
-            )
-        
-        # Only count answered questions (where user_answer is not null)
-        query = query.filter(Guess.user_answer.isnot(None))
-        
-        if user_id:
-            query = query.filter(Guess.user_id == user_id)
-        
-        # Filter by overall date range
-        overall_start = periods[0]['start']
-        overall_end = periods[-1]['end']
-        query = query.filter(
-            Guess.created_at >= overall_start,
-            Guess.created_at < overall_end
-        )
-        
-        query = query.group_by(date_format)
-
-    else:  # rounds
-        # Count completed rounds (rounds with ended_at set)
-        if period == "week":
-            # For week view, group by day
-            date_format = get_date_format_func(db, Round.ended_at, '%Y-%m-%d')
-            query = db.query(
-                date_format.label('period_date'),
-                func.count(Round.id).label('count')
-            )
-        else:  # month view - group by week start (Monday)
-            # For monthly view, group by the Monday of each week
-            if db.bind.dialect.name == 'postgresql':
-                week_start = func.date_trunc('week', Round.ended_at)
-                date_format = func.to_char(week_start, 'YYYY-MM-DD')
-            else:
-                # SQLite: Use a simpler approach - just group by day for now
-                date_format = get_date_format_func(db, Round.ended_at, '%Y-%m-%d')
-            
-            query = db.query(
-                date_format.label('period_date'),
-                func.count(Round.id).label('count')
-            )
-        
-        if user_id:
-            query = query.filter(Round.user_id == user_id)
-        
-        # Filter by overall date range and only completed rounds
-        overall_start = periods[0]['start']
-        overall_end = periods[-1]['end']
-        query = query.filter(
-            Round.ended_at.isnot(None),
-            Round.ended_at >= overall_start,
-            Round.ended_at < overall_end
-        )
-        
-        query = query.group_by(date_format)
+    # Other databases (SQLite): bucket keys computed in SQL, zero-filled against `periods` below
+    counts_source = _activity_counts(metric, user_id, periods[0]['start'], periods[-1]['end'], use_rollup=False)
+    if period == "month":
+        # Monday of the row's week
+        date_format = func.date(counts_source.c.ts, '-6 days', 'weekday 1')
+    else:
+        # Year rows are keyed by day too, so only the 1st of each month matches a month bucket
+        date_format = get_date_format_func(db, counts_source.c.ts, '%Y-%m-%d')
+    query = select(
+        date_format.label('period_date'),
+        func.sum(counts_source.c.cnt).label('count')
+    ).group_by(date_format).order_by(date_format)
     
     # Execute query
-    results = query.all()
-    
-    # Convert results to lookup dictionary
-    data_by_date = {}
-    # Both week and month periods now use YYYY-MM-DD format
-    for row in results:
-        data_by_date[row.period_date] = row.count
+    results = (await db.execute(query)).all()
     
-    # Build complete time series with zeros
+    # Build complete time series with zeros: periods and rows are both in YYYY-MM-DD order,
+    # so walk them in lockstep
     data_points = []
     total_value = 0
+    i = 0
     
     for p in periods:
-        value = data_by_date.get(p['date'], 0)
-        data_points.append(ActivityDataPoint(
-            date=p['date'],
-            value=value,
-            label=p['label']
-        ))
+        while i < len(results) and results[i].period_date < p['date']:
+            i += 1
+        if i < len(results) and results[i].period_date == p['date']:
+            value = results[i].count
+            i += 1
+        else:
+            value = 0
+        data_points.append({
+            'date': p['date'],
+            'value': value,
+            'label': p['label']
+        })
         total_value += value
     
     # Calculate average
     average = total_value / len(periods) if periods else 0
     
-    return ActivityResponse(
-        metric=metric,
-        period=period,
-        data=data_points,
-        total=total_value,
-        average=round(average, 1)
+    payload = {
+        "metric": metric,
+        "period": period,
+        "data": data_points,
+        "total": total_value,
+        "average": round(average, 1),
+    }
+    _metrics_cache.set(cache_key, payload)
+    return payload
+
+
+async def _with_session(build, *args):
+    # An AsyncSession runs one statement at a time, so each concurrent query gets its own
+    async with get_sessionmaker()() as session:
+        return await build(session, *args)
+
+
+async def _stream_activity_payload(metric: str, period: str, user_id: Optional[int]) -> Dict[str, Any]:
+    """Activity series for streams: cached briefly, and computed once for all waiting subscribers."""
+    key = ("activity", user_id, metric, period)
+    payload = _stream_cache.get(key)
+    if payload is not None:
+        return payload
+    refresh = _stream_refreshes.get(key)
+    if refresh is None:
+        refresh = asyncio.ensure_future(_with_session(_activity_payload, metric, period, user_id, False))
+        _stream_refreshes[key] = refresh
+        refresh.add_done_callback(lambda _: _stream_refreshes.pop(key, None))
+    # Shielded so one subscriber disconnecting doesn't cancel the query the others are waiting on
+    payload = await asyncio.shield(refresh)
+    _stream_cache.set(key, payload)
+    return payload
+
+
+@router.get("/activity/stream")
+async def stream_practice_activity(
+    request: Request,
+    metric: str = Query("questions", description="Metric to track: 'questions' or 'rounds'"),
+    period: str = Query("week", description="Time period: 'week' (days), 'month' (weeks), or 'year' (months)"),
+    user_id: Optional[int] = Query(None, description="Filter by user (optional)"),
+    interval: float = Query(5.0, ge=5, le=300, description="Seconds between checks for changes")
+):
+    """
+    Server-sent changelog of practice activity.
+    
+    The first event carries every bucket; later events only carry buckets whose value changed,
+    with the new value and the delta from the last emitted one (negative when e.g. a round is
+    no longer counted), and list under "removed" the buckets that rolled out of the window.
+    Checks read a series shared by every stream on the same metric, period and user, recomputed
+    at most every STREAM_REFRESH_SECONDS (and right after a write in this worker), so changes
+    show up within a few seconds of `interval`.
+    """
+    _validate_activity_params(metric, period)
+    
+    async def events():
+        emitted: Dict[str, int] = {}
+        while not await request.is_disconnected():
+            payload = await _stream_activity_payload(metric, period, user_id)
+            current = {point["date"]: point["value"] for point in payload["data"]}
+            changes = [
+                {**point, "delta": point["value"] - emitted.get(point["date"], 0)}
+                for point in payload["data"]
+                if emitted.get(point["date"]) != point["value"]
+            ]
+            removed = [date for date in emitted if date not in current]
+            emitted = current
+            if changes or removed:
+                event = {"metric": metric, "period": period, "changes": changes, "total": payload["total"]}
+                if removed:
+                    event["removed"] = removed
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.get("/overview")
+async def get_metrics_overview(
+    mood: Optional[List[str]] = Query(None, description="Filter coverage by specific mood(s)"),
+    user_id: Optional[int] = Query(None, description="Filter by user (optional)"),
+    min_questions: int = Query(1, description="Only include coverage bins with at least N questions"),
+    metric: str = Query("questions", description="Activity metric: 'questions' or 'rounds'"),
+    period: str = Query("week", description="Activity period: 'week', 'month', or 'year'")
+):
+    """
+    Coverage and activity for a dashboard in one request.
+    
+    Both aggregations run concurrently on separate pooled connections, so the response
+    takes about as long as the slower of the two.
+    """
+    coverage, activity = await asyncio.gather(
+        _with_session(_coverage_payload, mood, user_id, None, None, min_questions),
+        _with_session(_activity_payload, metric, period, user_id),
     )
+    return ORJSONResponse({"coverage": coverage, "activity": activity})
+
+
+@router.get("/cache-info")
+async def get_cache_info():
+    """Hit/miss counters for the conjugation cache (per worker process)."""
+    return cached_conjugation.cache_info()._asdict()
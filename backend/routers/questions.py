@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from pydantic import BaseModel, Field, validator, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from db import get_db
 from spanishconjugator import Conjugator
 from utils import is_verb_regular_for_tense
@@ -13,44 +13,57 @@ from models import PronounEnum, TenseEnum, MoodEnum
 
 router = APIRouter()
 
+# Valid values per filter, built once; the lists keep enum declaration order for error messages
+_VALID_PRONOUNS = frozenset(e.value for e in PronounEnum)
+_VALID_TENSES = frozenset(e.value for e in TenseEnum)
+_VALID_MOODS = frozenset(e.value for e in MoodEnum)
+_VALID_PRONOUNS_LIST = [e.value for e in PronounEnum]
+_VALID_TENSES_LIST = [e.value for e in TenseEnum]
+_VALID_MOODS_LIST = [e.value for e in MoodEnum]
+
 def validate_enum_lists(pronouns: List[str], tenses: List[str], moods: List[str]):
     """Validate that all values in the lists are valid enum values"""
     errors = []
     
     # Validate pronouns
-    valid_pronouns = {e.value for e in PronounEnum}
-    for pronoun in pronouns:
-        if pronoun not in valid_pronouns:
-            errors.append(f"Invalid value '{pronoun}' for pronoun. Valid values: {list(valid_pronouns)}")
+    if not _VALID_PRONOUNS.issuperset(pronouns):
+        errors.extend(
+            f"Invalid value '{pronoun}' for pronoun. Valid values: {_VALID_PRONOUNS_LIST}"
+            for pronoun in pronouns if pronoun not in _VALID_PRONOUNS
+        )
     
     # Validate tenses  
-    valid_tenses = {e.value for e in TenseEnum}
-    for tense in tenses:
-        if tense not in valid_tenses:
-            errors.append(f"Invalid value '{tense}' for tense. Valid values: {list(valid_tenses)}")
+    if not _VALID_TENSES.issuperset(tenses):
+        errors.extend(
+            f"Invalid value '{tense}' for tense. Valid values: {_VALID_TENSES_LIST}"
+            for tense in tenses if tense not in _VALID_TENSES
+        )
             
     # Validate moods
-    valid_moods = {e.value for e in MoodEnum}  
-    for mood in moods:
-        if mood not in valid_moods:
-            errors.append(f"Invalid value '{mood}' for mood. Valid values: {list(valid_moods)}")
+    if not _VALID_MOODS.issuperset(moods):
+        errors.extend(
+            f"Invalid value '{mood}' for mood. Valid values: {_VALID_MOODS_LIST}"
+            for mood in moods if mood not in _VALID_MOODS
+        )
     
     return errors
 
 class FilterParams(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     pronoun: List[str] = Field(default=["yo", "tu"], description="Filter by pronouns (yo, tu, usted, etc.)")
     tense: List[str] = Field(default=["present"], description="Filter by tenses")
     mood: List[str] = Field(default=["indicative"], description="Filter by moods")
     limit: int = Field(1, ge=1, le=100, description="Number of questions to return")
 
 @router.get("/")
-def get_questions(
+async def get_questions(
     pronoun: List[str] = Query(default=["yo", "tu"], description="Filter by pronouns (yo, tu, usted, etc.)", alias="pronoun"),
     tense: List[str] = Query(default=["present"], description="Filter by tenses", alias="tense"), 
     mood: List[str] = Query(default=["indicative"], description="Filter by moods", alias="mood"),
     limit: int = Query(default=1, ge=1, le=100, description="Number of questions to return"),
     verb_class: str = Query(default="top20", description="Verb class to use (e.g., 'top10', 'top20', 'top50')"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     question_service: QuestionService = Depends(get_question_service)
 ):
     """Get questions with random combinations of pronouns, tenses, and moods"""
@@ -91,7 +104,7 @@ def get_questions(
     
     # Use the service to generate questions
     try:
-        questions = question_service.generate_questions(
+        questions = await question_service.generate_questions(
             pronouns=filters.pronoun,
             tenses=filters.tense,
             moods=filters.mood,
@@ -123,7 +136,7 @@ def get_questions(
 
 
 @router.get("/verb-sets/{verb_class}")
-def get_verb_set(
+async def get_verb_set(
     verb_class: str,
     question_service: QuestionService = Depends(get_question_service)
 ):
@@ -138,7 +151,7 @@ def get_verb_set(
         Dictionary with verb class info and list of verbs (sorted alphabetically)
     """
     try:
-        verbs = question_service.get_verbs_by_class(verb_class)
+        verbs = await question_service.get_verbs_by_class(verb_class)
         
         # Sort verbs alphabetically
         verbs_sorted = sorted(verbs)
@@ -1,18 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+import asyncio
+import contextlib
+import os
+import weakref
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from db import get_db
-from services import QuestionService, create_round_service
-from dependencies import get_question_service
-from models import Round, Guess, Verb
+from services import RoundService
+from dependencies import get_round_service
+from models import Round, Guess, PronounEnum, TenseEnum, MoodEnum
+from cache import TTLCache
+from routers.metrics import invalidate_user_metrics
 
 router = APIRouter(prefix="/rounds", tags=["rounds"])
 
+# Polled round reads are served from a short per-process cache. Writes handled by this worker clear it;
+# other workers may serve a read up to ROUND_CACHE_TTL seconds old.
+ROUND_CACHE_TTL = float(os.getenv("ROUND_CACHE_TTL", "5"))
+_round_cache = TTLCache(ttl=ROUND_CACHE_TTL)
+
+# One lock per user serializes round creation within this process. A create that arrives while another
+# is in flight for the same user (double-click, client retry) returns the round that one made.
+# Anonymous requests (no user_id) can't be told apart, so they are neither serialized nor coalesced.
+_create_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _create_lock(user_id: Optional[int]):
+    if user_id is None:
+        return contextlib.nullcontext()
+    lock = _create_locks.get(user_id)
+    if lock is None:
+        lock = _create_locks[user_id] = asyncio.Lock()
+    return lock
+
+# Handlers return ORJSONResponse directly: the service dicts already match the response models,
+# so revalidating them and running jsonable_encoder on every poll is wasted work.
+# response_model stays declared for the OpenAPI schema.
+
+class RoundFilters(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
+    pronouns: List[PronounEnum] = Field(description="Pronouns to draw questions from")
+    tenses: List[TenseEnum] = Field(description="Tenses to draw questions from")
+    moods: List[MoodEnum] = Field(description="Moods to draw questions from")
+
 class CreateRoundRequest(BaseModel):
-    filters: dict = Field(description="Filter object with pronouns, tenses, and moods lists")
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
+    filters: RoundFilters = Field(description="Filter object with pronouns, tenses, and moods lists")
     num_questions: int = Field(default=12, ge=1, le=50, description="Number of questions in the round")
     user_id: Optional[int] = Field(default=None, description="User ID for multi-user support")
     verb_class: str = Field(default="top20", description="Verb class to use (e.g., 'top10', 'top20', 'top50')")
@@ -28,6 +68,8 @@ class TransitionResponse(BaseModel):
     transition_reason: str
 
 class SubmitGuessRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     guess_id: int = Field(description="ID of the guess to update")
     user_answer: Optional[str] = Field(default=None, description="User's submitted answer (omit for skip)")
     is_correct: Optional[bool] = Field(default=None, description="Whether the answer is correct (omit for skip)")
@@ -51,25 +93,37 @@ class RoundHistoryItem(BaseModel):
     questions: Optional[List[dict]] = None
 
 @router.post("", response_model=RoundResponse)
-def create_round(
+async def create_round(
     request: CreateRoundRequest,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    round_service: RoundService = Depends(get_round_service)
 ):
     """Create a new round with pre-generated guesses"""
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
-        
-        # Create the round
-        result = round_service.create_round(
-            filters=request.filters,
-            num_questions=request.num_questions,
-            user_id=request.user_id,
-            verb_class=request.verb_class
-        )
+        filters = request.filters.model_dump(mode='json')
+        lock = _create_lock(request.user_id)
+        contended = isinstance(lock, asyncio.Lock) and lock.locked()
+        async with lock:
+            if contended:
+                # Only a duplicate of the create we waited on is answered with the round it made
+                active = await round_service.get_active_round(user_id=request.user_id)
+                if (
+                    active
+                    and active["round"]["filters"] == filters
+                    and active["round"]["num_questions"] == request.num_questions
+                ):
+                    return ORJSONResponse(active)
+            
+            # Create the round
+            result = await round_service.create_round(
+                filters=filters,
+                num_questions=request.num_questions,
+                user_id=request.user_id,
+                verb_class=request.verb_class
+            )
+            _round_cache.clear()
+            invalidate_user_metrics(request.user_id)
         
-        return result
+        return ORJSONResponse(result)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -79,20 +133,19 @@ def create_round(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/{round_id}/complete", response_model=RoundResponse)
-def complete_round(
+async def complete_round(
     round_id: int,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    db: AsyncSession = Depends(get_db),
+    round_service: RoundService = Depends(get_round_service)
 ):
     """Complete a round by setting ended_at and calculating correct answers"""
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
-        
         # Complete the round
-        result = round_service.complete_round(round_id)
+        result = await round_service.complete_round(round_id)
+        _round_cache.clear()
+        invalidate_user_metrics(result['round']['user_id'])
         
-        return result
+        return ORJSONResponse(result)
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -100,22 +153,22 @@ def complete_round(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/active", response_model=RoundResponse)
-def get_active_round(
+async def get_active_round(
     user_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    round_service: RoundService = Depends(get_round_service)
 ):
     """Get the currently active (incomplete) round"""
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
+        cache_key = ("active", user_id)
+        result = _round_cache.get(cache_key)
+        if result is None:
+            # Get active round
+            result = await round_service.get_active_round(user_id=user_id)
+            if not result:
+                raise HTTPException(status_code=404, detail="No active round found")
+            _round_cache.set(cache_key, result)
         
-        # Get active round
-        result = round_service.get_active_round(user_id=user_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="No active round found")
-        
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -123,30 +176,33 @@ def get_active_round(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.get("/history", response_model=HistoryResponse)
-def get_rounds_history(
+async def get_rounds_history(
     user_id: Optional[int] = None,
     include_questions: bool = Query(False, description="Whether to include questions in each round"),
     include_incomplete: bool = Query(False, description="Whether to include incomplete rounds"),
     limit: int = Query(50, ge=1, le=200, description="Maximum number of rounds to return"),
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get history of rounds in reverse chronological order"""
     try:
         # Base query for rounds
-        query = db.query(Round)
+        query = select(Round)
         
         # Filter out incomplete rounds unless explicitly requested
         if not include_incomplete:
-            query = query.filter(Round.ended_at.isnot(None))
+            query = query.where(Round.ended_at.isnot(None))
         
         # Filter by user if provided
         if user_id is not None:
-            query = query.filter(Round.user_id == user_id)
+            query = query.where(Round.user_id == user_id)
+        
+        # Load every listed round's guesses and their verbs in two batched queries, not one per round
+        if include_questions:
+            query = query.options(selectinload(Round.guesses).selectinload(Guess.verb))
         
         # Order by most recent first (use started_at if ended_at might be null)
         order_column = Round.ended_at if not include_incomplete else Round.started_at
-        rounds = query.order_by(order_column.desc()).limit(limit).all()
+        rounds = (await db.scalars(query.order_by(order_column.desc()).limit(limit))).all()
         
         history = []
         for round in rounds:
@@ -169,10 +225,9 @@ def get_rounds_history(
             
             # Include questions if requested
             if include_questions:
-                guesses = db.query(Guess).filter(Guess.round_id == round.id).order_by(Guess.id).all()
                 questions = []
-                for guess in guesses:
-                    verb_obj = db.query(Verb).filter(Verb.id == guess.verb_id).first()
+                for guess in sorted(round.guesses, key=lambda g: g.id):
+                    verb_obj = guess.verb
                     question_data = {
                         "id": guess.id,
                         "verb": verb_obj.infinitive if verb_obj else None,
@@ -197,22 +252,22 @@ def get_rounds_history(
         raise HTTPException(status_code=500, detail=f"Error retrieving history: {str(e)}")
 
 @router.get("/{round_id}", response_model=RoundResponse)
-def get_round(
+async def get_round(
     round_id: int,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    round_service: RoundService = Depends(get_round_service)
 ):
     """Get a specific round with its guesses"""
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
+        cache_key = ("round", round_id)
+        result = _round_cache.get(cache_key)
+        if result is None:
+            # Get the round
+            result = await round_service.get_round(round_id)
+            if not result:
+                raise HTTPException(status_code=404, detail="Round not found")
+            _round_cache.set(cache_key, result)
         
-        # Get the round
-        result = round_service.get_round(round_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="Round not found")
-        
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -220,30 +275,29 @@ def get_round(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.post("/{round_id}/transition", response_model=TransitionResponse)
-def transition_round(
+async def transition_round(
     round_id: int,
     request: CreateRoundRequest,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    round_service: RoundService = Depends(get_round_service)
 ):
     """
     Complete the current round and create a new round with different filters.
     This is used when filters are changed mid-round.
     """
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
-        
         # Transition to new round
-        result = round_service.transition_to_new_round(
-            current_round_id=round_id,
-            new_filters=request.filters,
-            num_questions=request.num_questions,
-            user_id=request.user_id,
-            verb_class=request.verb_class
-        )
+        async with _create_lock(request.user_id):
+            result = await round_service.transition_to_new_round(
+                current_round_id=round_id,
+                new_filters=request.filters.model_dump(mode='json'),
+                num_questions=request.num_questions,
+                user_id=request.user_id,
+                verb_class=request.verb_class
+            )
+            _round_cache.clear()
+            invalidate_user_metrics(request.user_id)
         
-        return result
+        return ORJSONResponse(result)
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -251,27 +305,25 @@ def transition_round(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.put("/guesses/{guess_id}", response_model=GuessResponse)
-def submit_guess(
+async def submit_guess(
     guess_id: int,
     request: SubmitGuessRequest,
-    db: Session = Depends(get_db),
-    question_service: QuestionService = Depends(get_question_service)
+    db: AsyncSession = Depends(get_db),
+    round_service: RoundService = Depends(get_round_service)
 ):
     """Submit a user's answer for a guess"""
     try:
-        # Create round service
-        round_service = create_round_service(question_service, db)
-        
         # Handle skip explicitly
         if request.skipped:
-            guess = db.query(Guess).filter(Guess.id == guess_id).first()
+            guess = await db.scalar(
+                select(Guess).options(selectinload(Guess.verb)).where(Guess.id == guess_id)
+            )
             if not guess:
                 raise ValueError(f"Guess with id {guess_id} not found")
             guess.user_answer = None
             guess.is_correct = None
             guess.skipped = True
-            db.commit()
-            db.refresh(guess)
+            await db.commit()
             updated_guess = {
                 'id': guess.id,
                 'verb': guess.verb.infinitive if guess.verb else "unknown",
@@ -281,18 +333,22 @@ def submit_guess(
                 'correct_answer': guess.correct_answer,
                 'user_answer': guess.user_answer,
                 'is_correct': guess.is_correct,
-                    'skipped': guess.skipped,
-                    'irregular': guess.irregular,
+                'skipped': guess.skipped,
+                'irregular': guess.irregular,
+                'user_id': guess.user_id,
             }
         else:
             # Update the guess with provided answer
-            updated_guess = round_service.update_guess(
+            updated_guess = await round_service.update_guess(
                 guess_id=guess_id,
                 user_answer=request.user_answer or "",
                 is_correct=bool(request.is_correct)
             )
         
-        return {"guess": updated_guess}
+        _round_cache.clear()
+        invalidate_user_metrics(updated_guess['user_id'])
+        
+        return ORJSONResponse({"guess": updated_guess})
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1,11 +1,21 @@
 from services import VerbService
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi.responses import Response
 from dependencies import get_verb_service
+from cache import TTLCache
+import orjson
 
 router = APIRouter(prefix="/verbs", tags=["verbs"])
 
+# Conjugation tables are deterministic per infinitive; keep the serialized body for a day
+_conjugations_cache = TTLCache(ttl=86400, maxsize=2048)
+
+# Conjugating one verb takes well under a millisecond, so it runs on the event loop rather than a worker thread
 @router.get("/{verb}/conjugations")
-def get_conjugations(verb: str, db: Session = Depends(get_db), verb_service: VerbService = Depends(get_verb_service)):
-    return verb_service.get_conjugations(verb)
\ No newline at end of file
+async def get_conjugations(verb: str, verb_service: VerbService = Depends(get_verb_service)):
+    body = _conjugations_cache.get(verb)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+    body = orjson.dumps(verb_service.get_conjugations(verb))
+    _conjugations_cache.set(verb, body)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
@@ -2,20 +2,30 @@
 """
 Realistic Spanish Conjugation Test Data Generator (script-friendly)
 """
+import csv
+import io
 import os
 import sys
 import random
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Tuple
+from itertools import accumulate
+from typing import Iterator, List, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import sessionmaker
 
 # Ensure backend package is importable
 backend_path = Path(__file__).parent.parent  # scripts -> backend
 sys.path.insert(0, str(backend_path))
 
-from sqlalchemy.orm import sessionmaker
 from models import Base, Verb, Round, Guess, TenseEnum, MoodEnum, PronounEnum
-from db import get_engine, get_sessionmaker
+from db import get_sync_engine
+from utils import iter_chunks
+
+# One seeded generator for every draw so a given SEED reproduces the same dataset
+rng = random.Random(int(os.getenv('SEED', '0')))
 
 
 SPANISH_VERBS: Dict[str, Dict[str, object]] = {
@@ -85,95 +95,181 @@ PRONOUN_WEIGHTS: Dict[PronounEnum, float] = {
 }
 
 
-def weighted_choice(choices_weights: Dict) -> any:
-    choices = list(choices_weights.keys())
-    weights = list(choices_weights.values())
-    return random.choices(choices, weights=weights)[0]
+class AliasTable(NamedTuple):
+    keys: list
+    prob: List[float]
+    alias: list  # the key to return when the coin flip fails, already resolved from its index
+
+
+def build_alias(weights: Dict) -> AliasTable:
+    """Build a Vose alias table so each weighted draw is O(1)."""
+    keys = list(weights.keys())
+    n = len(keys)
+    total = sum(weights.values())
+    scaled = [w * n / total for w in weights.values()]
+    prob = [0.0] * n
+    alias = [0] * n
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        small_i, large_i = small.pop(), large.pop()
+        prob[small_i] = scaled[small_i]
+        alias[small_i] = large_i
+        scaled[large_i] -= 1.0 - scaled[small_i]
+        (small if scaled[large_i] < 1.0 else large).append(large_i)
+    # Whatever is left over is 1.0 up to rounding error
+    for i in small + large:
+        prob[i] = 1.0
+    return AliasTable(keys, prob, [keys[a] for a in alias])
+
+
+def sample_alias(table: AliasTable, n: int) -> list:
+    """Draw n weighted samples; one uniform per draw picks both the column and the coin flip."""
+    keys, prob, alias = table
+    size = len(keys)
+    rand = rng.random
+    out = [None] * n
+    for j in range(n):
+        u = rand() * size
+        i = int(u)
+        out[j] = keys[i] if u - i < prob[i] else alias[i]
+    return out
+
+
+VERB_WEIGHT_MAP = {k: v['weight'] for k, v in SPANISH_VERBS.items()}
+TENSE_WEIGHT_MAP = {k: v['weight'] for k, v in INDICATIVE_TENSES.items()}
+# Rounds per day and questions per round for the practice schedule
+ROUNDS_PER_DAY_WEIGHTS = {0: 20, 1: 35, 2: 25, 3: 12, 4: 5, 5: 2, 6: 1}
+QUESTIONS_PER_ROUND_WEIGHTS = {5: 5, 6: 5, 7: 8, 8: 10, 9: 12, 10: 15, 11: 12, 12: 12, 13: 10, 14: 8, 15: 8, 16: 5, 17: 3, 18: 2, 19: 2, 20: 2, 21: 1, 22: 1, 23: 1, 24: 1, 25: 1}
+
+# Alias tables are built once so each round's draws cost O(1) per question
+VERB_ALIAS = build_alias(VERB_WEIGHT_MAP)
+TENSE_ALIAS = build_alias(TENSE_WEIGHT_MAP)
+PRONOUN_ALIAS = build_alias(PRONOUN_WEIGHTS)
+ROUNDS_PER_DAY_ALIAS = build_alias(ROUNDS_PER_DAY_WEIGHTS)
+QUESTIONS_PER_ROUND_ALIAS = build_alias(QUESTIONS_PER_ROUND_WEIGHTS)
+# Hour of day for days with a single round
+SINGLE_ROUND_HOUR_ALIAS = build_alias({8: 5, 9: 5, 17: 15, 18: 25, 19: 25, 20: 20, 21: 5})
 
 
 def create_verbs(session) -> Dict[str, int]:
     print("Creating Spanish verbs...")
-    verb_ids: Dict[str, int] = {}
-    for infinitive, data in SPANISH_VERBS.items():
-        verb = Verb(infinitive=infinitive, definition=data['definition'])
-        session.add(verb)
-        session.flush()
-        verb_ids[infinitive] = verb.id
-    session.commit()
+    infinitives = list(SPANISH_VERBS)
+    ids = session.execute(
+        insert(Verb).returning(Verb.id, sort_by_parameter_order=True),
+        [{'infinitive': infinitive, 'definition': SPANISH_VERBS[infinitive]['definition']} for infinitive in infinitives],
+    ).scalars().all()
+    verb_ids: Dict[str, int] = dict(zip(infinitives, ids))
     print(f"Created {len(verb_ids)} verbs")
     return verb_ids
 
 
-def generate_practice_schedule(start_date: datetime, end_date: datetime) -> List[Tuple[datetime, int]]:
-    schedule: List[Tuple[datetime, int]] = []
-    current_date = start_date
-    while current_date <= end_date:
-        round_weights = {0: 20, 1: 35, 2: 25, 3: 12, 4: 5, 5: 2, 6: 1}
-        num_rounds = weighted_choice(round_weights)
+def generate_practice_schedule(start_date: datetime, end_date: datetime) -> Iterator[Tuple[datetime, int]]:
+    """Yield (practice_time, num_questions) for each round, in chronological order."""
+    # Draw every day's round count, and every per-round value for all of them, up front
+    day_rounds = sample_alias(ROUNDS_PER_DAY_ALIAS, (end_date - start_date).days + 1)
+    total_rounds = sum(day_rounds)
+    question_counts = iter(sample_alias(QUESTIONS_PER_ROUND_ALIAS, total_rounds))
+    single_round_hours = iter(sample_alias(SINGLE_ROUND_HOUR_ALIAS, total_rounds))
+    minutes = iter(rng.choices(range(60), k=total_rounds))
+    seconds = iter(rng.choices(range(60), k=total_rounds))
+    spacings = iter(rng.choices(range(10, 31), k=total_rounds))
+    hours = [8, 11, 14, 17, 19, 21]
+    for day_offset, num_rounds in enumerate(day_rounds):
         if num_rounds == 0:
-            current_date += timedelta(days=1)
             continue
+        current_date = start_date + timedelta(days=day_offset)
         if current_date.weekday() >= 5 and num_rounds > 3:
             num_rounds = max(1, num_rounds - 2)
         for round_num in range(num_rounds):
             if num_rounds == 1:
-                practice_hour = random.choices([8, 9, 17, 18, 19, 20, 21], weights=[5, 5, 15, 25, 25, 20, 5])[0]
+                practice_hour = next(single_round_hours)
             elif num_rounds == 2:
-                practice_hour = 9 if round_num == 0 else random.choice([18, 19, 20])
+                practice_hour = 9 if round_num == 0 else rng.choice([18, 19, 20])
             else:
-                hours = [8, 11, 14, 17, 19, 21]
                 practice_hour = hours[min(round_num, len(hours) - 1)]
-            questions_weights = {5: 5, 6: 5, 7: 8, 8: 10, 9: 12, 10: 15, 11: 12, 12: 12, 13: 10, 14: 8, 15: 8, 16: 5, 17: 3, 18: 2, 19: 2, 20: 2, 21: 1, 22: 1, 23: 1, 24: 1, 25: 1}
-            num_questions = weighted_choice(questions_weights)
-            practice_time = current_date.replace(hour=practice_hour, minute=random.randint(0, 59), second=random.randint(0, 59))
-            practice_time += timedelta(minutes=round_num * random.randint(10, 30))
-            schedule.append((practice_time, num_questions))
-        current_date += timedelta(days=1)
-    return schedule
+            num_questions = next(question_counts)
+            practice_time = current_date.replace(hour=practice_hour, minute=next(minutes), second=next(seconds))
+            practice_time += timedelta(minutes=round_num * next(spacings))
+            yield practice_time, num_questions
 
 
-def generate_conjugation(verb: str, pronoun: PronounEnum, tense: TenseEnum) -> Tuple[str, bool]:
+# (verb, pronoun, tense) -> correct answer, built once before any rounds; failures are stored as None
+CONJ_TABLE: Dict[Tuple[str, PronounEnum, TenseEnum], Optional[str]] = {}
+
+
+def build_conjugation_table() -> None:
+    """Conjugate every verb/pronoun/tense the generator can draw, with one shared conjugator."""
     from services import QuestionService
-    from spanishconjugator import Conjugator
-    SessionLocal = get_sessionmaker()
-    db = SessionLocal()
-    try:
-        conjugator = Conjugator()
-        service = QuestionService(conjugator, db)
-        correct_answer = service._get_conjugation(verb, tense.value, "indicative", pronoun.value)
-        if not correct_answer or len(correct_answer.strip()) < 2:
-            print(f"⚠️  Skipping {verb}/{pronoun.value}/{tense.value} - conjugation failed")
-            db.close()
-            return None, False
-    except Exception as e:
-        print(f"❌ Error generating conjugation for {verb}/{pronoun.value}/{tense.value}: {e}")
-        db.close()
+    # _get_conjugation never touches the database, so no session is needed
+    question_service = QuestionService()
+    for verb in SPANISH_VERBS:
+        for pronoun in PRONOUN_WEIGHTS:
+            for tense in INDICATIVE_TENSES:
+                try:
+                    answer = question_service._get_conjugation(verb, tense.value, "indicative", pronoun.value)
+                except Exception as e:
+                    print(f"❌ Error generating conjugation for {verb}/{pronoun.value}/{tense.value}: {e}")
+                    answer = None
+                CONJ_TABLE[verb, pronoun, tense] = answer
+
+
+# Questions skipped for a failed conjugation, reported once at the end rather than printed per question
+SKIPPED_CONJUGATIONS: Counter = Counter()
+
+
+def generate_conjugation(verb: str, pronoun: PronounEnum, tense: TenseEnum) -> Tuple[str, bool]:
+    correct_answer = CONJ_TABLE.get((verb, pronoun, tense))
+    if not correct_answer or len(correct_answer.strip()) < 2:
+        SKIPPED_CONJUGATIONS[verb, pronoun.value, tense.value] += 1
         return None, False
-    finally:
-        db.close()
     accuracy_base = INDICATIVE_TENSES[tense]['accuracy_base']
-    verb_difficulty_modifier = random.uniform(-10, 10)
+    verb_difficulty_modifier = rng.uniform(-10, 10)
     final_accuracy = max(30, min(95, accuracy_base + verb_difficulty_modifier))
-    is_correct = random.random() * 100 < final_accuracy
+    is_correct = rng.random() * 100 < final_accuracy
     return correct_answer, is_correct
 
 
-def create_practice_session(session, verb_ids: Dict[str, int], practice_time: datetime, num_questions: int) -> None:
-    round_obj = Round(
-        user_id=1,
-        started_at=practice_time,
-        ended_at=practice_time + timedelta(minutes=random.randint(5, 30)),
-        num_questions=num_questions,
-        filters={"mood": ["indicative"]}
+WRONG_ENDINGS = ('o', 'as', 'a', 'amos', 'an', 'es', 'e')
+
+
+class QuestionDraws(NamedTuple):
+    """Column-wise draws for a run of questions; rounds take consecutive slices."""
+    verbs: list
+    tenses: list
+    pronouns: list
+
+
+def sample_questions(n: int) -> QuestionDraws:
+    return QuestionDraws(
+        sample_alias(VERB_ALIAS, n),
+        sample_alias(TENSE_ALIAS, n),
+        sample_alias(PRONOUN_ALIAS, n),
     )
-    session.add(round_obj)
-    session.flush()
+
+
+def create_practice_session(verb_ids: Dict[str, int], practice_time: datetime, draws: QuestionDraws, start: int, num_questions: int) -> Tuple[Dict[str, object], List[Dict[str, object]]]:
+    """Build one round row and its guess rows from draws[start:start + num_questions].
+
+    write_rounds inserts them and fills in round_id.
+    """
+    round_row: Dict[str, object] = {
+        'user_id': 1,
+        'started_at': practice_time,
+        'ended_at': practice_time + timedelta(minutes=rng.randint(5, 30)),
+        'num_questions': num_questions,
+        'filters': {"mood": ["indicative"]},
+    }
     correct_answers = 0
-    for i in range(num_questions):
-        verb_name = weighted_choice({k: v['weight'] for k, v in SPANISH_VERBS.items()})
+    rows: List[Dict[str, object]] = []
+    end = start + num_questions
+    verbs, tenses, pronouns = draws.verbs[start:end], draws.tenses[start:end], draws.pronouns[start:end]
+    # Questions follow each other 10-60 seconds apart
+    offsets = accumulate(rng.choices(range(10, 61), k=num_questions - 1), initial=0)
+    # Hoisted lookups: this loop runs once per generated guess
+    rand, choice, append, indicative = rng.random, rng.choice, rows.append, MoodEnum.indicative
+    for verb_name, tense, pronoun, offset in zip(verbs, tenses, pronouns, offsets):
         verb_id = verb_ids[verb_name]
-        tense = weighted_choice({k: v['weight'] for k, v in INDICATIVE_TENSES.items()})
-        pronoun = weighted_choice(PRONOUN_WEIGHTS)
         conjugation_result = generate_conjugation(verb_name, pronoun, tense)
         if conjugation_result[0] is None:
             continue
@@ -183,103 +279,148 @@ def create_practice_session(session, verb_ids: Dict[str, int], practice_time: da
             correct_answers += 1
         else:
             if len(correct_answer) > 3:
-                wrong_endings = ['o', 'as', 'a', 'amos', 'an', 'es', 'e']
-                user_answer = correct_answer[:-2] + random.choice(wrong_endings)
+                user_answer = correct_answer[:-2] + choice(WRONG_ENDINGS)
             else:
                 user_answer = correct_answer + "x"
-        question_time = practice_time + timedelta(seconds=i * random.randint(10, 60))
-        guess = Guess(
-            user_id=1,
-            round_id=round_obj.id,
-            verb_id=verb_id,
-            pronoun=pronoun,
-            tense=tense,
-            mood=MoodEnum.indicative,
-            user_answer=user_answer if random.random() > 0.05 else None,
-            correct_answer=correct_answer,
-            is_correct=is_correct,
-            created_at=question_time
-        )
-        session.add(guess)
-    round_obj.num_correct_answers = correct_answers
-    session.commit()
+        question_time = practice_time + timedelta(seconds=offset)
+        append({
+            'user_id': 1,
+            'verb_id': verb_id,
+            'pronoun': pronoun,
+            'tense': tense,
+            'mood': indicative,
+            'user_answer': user_answer if rand() > 0.05 else None,
+            'correct_answer': correct_answer,
+            'is_correct': is_correct,
+            'created_at': question_time,
+        })
+    round_row['num_correct_answers'] = correct_answers
+    return round_row, rows
+
+
+GUESS_COPY_COLUMNS = ('user_id', 'round_id', 'verb_id', 'pronoun', 'tense', 'mood',
+                      'user_answer', 'correct_answer', 'is_correct', 'created_at')
+
+
+def flush_guesses(session, rows: List[Dict[str, object]]) -> None:
+    """Write pending guess rows: COPY FROM STDIN on Postgres, one executemany INSERT elsewhere."""
+    if not rows:
+        return
+    connection = session.connection()
+    if connection.dialect.name != 'postgresql':
+        connection.execute(Guess.__table__.insert(), rows)
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        # Enum columns are stored as their string values; None becomes an unquoted empty field (NULL)
+        writer.writerow([getattr(row[col], 'value', row[col]) for col in GUESS_COPY_COLUMNS])
+    buf.seek(0)
+    # Same DBAPI connection as the session, so the COPY joins its transaction
+    with connection.connection.driver_connection.cursor() as cur:
+        cur.copy_expert(f"COPY guesses ({', '.join(GUESS_COPY_COLUMNS)}) FROM STDIN WITH CSV", buf)
+
+
+def write_rounds(session, batch: List[Tuple[Dict[str, object], List[Dict[str, object]]]]) -> None:
+    """Insert a batch of rounds in one statement, then their guesses under the returned ids."""
+    if not batch:
+        return
+    round_ids = session.execute(
+        insert(Round).returning(Round.id, sort_by_parameter_order=True),
+        [round_row for round_row, _ in batch],
+    ).scalars().all()
+    guesses: List[Dict[str, object]] = []
+    for round_id, (_, rows) in zip(round_ids, batch):
+        for row in rows:
+            row['round_id'] = round_id
+        guesses.extend(rows)
+    flush_guesses(session, guesses)
 
 
 def generate_test_data(months_back: int = 3):
-    engine = get_engine()
+    engine = get_sync_engine()
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        print("Clearing existing data...")
-        session.query(Guess).delete()
-        session.query(Round).delete()
-        session.query(Verb).delete()
-        session.commit()
-        verb_ids = create_verbs(session)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=months_back * 30)
-        print(f"Generating practice schedule from {start_date.date()} to {end_date.date()}...")
-        schedule = generate_practice_schedule(start_date, end_date)
-        print(f"Creating {len(schedule)} practice rounds...")
-        total_questions = 0
-        for i, (practice_time, num_questions) in enumerate(schedule):
-            create_practice_session(session, verb_ids, practice_time, num_questions)
-            total_questions += num_questions
-            if (i + 1) % 20 == 0:
-                print(f"  Created {i + 1}/{len(schedule)} rounds...")
-
-        # Ensure there's an active round (no ended_at) with unanswered questions
-        active_num_questions = 10
-        now = datetime.now()
-        active_round = Round(
-            user_id=1,
-            started_at=now,
-            ended_at=None,
-            num_questions=active_num_questions,
-            filters={"mood": ["indicative"]}
-        )
-        session.add(active_round)
-        session.flush()
-
-        for i in range(active_num_questions):
-            verb_name = weighted_choice({k: v['weight'] for k, v in SPANISH_VERBS.items()})
-            verb_id = verb_ids[verb_name]
-            tense = weighted_choice({k: v['weight'] for k, v in INDICATIVE_TENSES.items()})
-            pronoun = weighted_choice(PRONOUN_WEIGHTS)
-            # Generate correct answer so we have the target, but leave user_answer/is_correct null
-            conjugation_result = generate_conjugation(verb_name, pronoun, tense)
-            if conjugation_result[0] is None:
-                continue
-            correct_answer, _ = conjugation_result
-            guess = Guess(
-                user_id=1,
-                round_id=active_round.id,
-                verb_id=verb_id,
-                pronoun=pronoun,
-                tense=tense,
-                mood=MoodEnum.indicative,
-                user_answer=None,
-                correct_answer=correct_answer,
-                is_correct=None,
-                created_at=now
-            )
-            session.add(guess)
-        session.commit()
-        print("Created 1 active round with unanswered questions")
-        print(f"\n✅ Test data generation complete!")
-        print(f"📊 Generated:")
-        print(f"   - {len(SPANISH_VERBS)} Spanish verbs")
-        print(f"   - {len(schedule)} practice rounds (0-6 per day)")
-        print(f"   - {total_questions} total questions (completed rounds)")
-        print(f"   - Data spans {months_back} months")
-        print(f"   - Focus: Indicative mood")
-    except Exception as e:
-        print(f"❌ Error generating test data: {e}")
-        session.rollback()
-        raise
-    finally:
-        session.close()
+    # Closing the session rolls back anything left uncommitted, so errors need no explicit rollback
+    with Session() as session:
+        try:
+            print("Clearing existing data...")
+            if engine.dialect.name == 'postgresql':
+                session.execute(text("TRUNCATE guesses, rounds, verbs RESTART IDENTITY CASCADE"))
+            else:
+                # Nothing is loaded in this session, so skip the identity-map sync
+                session.query(Guess).delete(synchronize_session=False)
+                session.query(Round).delete(synchronize_session=False)
+                session.query(Verb).delete(synchronize_session=False)
+            verb_ids = create_verbs(session)
+            build_conjugation_table()
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=months_back * 30)
+            print(f"Generating practice schedule from {start_date.date()} to {end_date.date()}...")
+            schedule = generate_practice_schedule(start_date, end_date)
+            print("Creating practice rounds...")
+            total_rounds = 0
+            total_questions = 0
+            # Consume the schedule 200 rounds at a time: one set of draws and one insert batch each.
+            # Everything, including the clear above, commits once at the end.
+            for rounds in iter_chunks(schedule, 200):
+                # Draw every question of the batch in one pass; each round consumes the next slice
+                draws = sample_questions(sum(num_questions for _, num_questions in rounds))
+                position = 0
+                batch: List[Tuple[Dict[str, object], List[Dict[str, object]]]] = []
+                for practice_time, num_questions in rounds:
+                    batch.append(create_practice_session(verb_ids, practice_time, draws, position, num_questions))
+                    position += num_questions
+                write_rounds(session, batch)
+                total_rounds += len(rounds)
+                total_questions += position
+                print(f"  Created {total_rounds} rounds...")
+
+            # Ensure there's an active round (no ended_at) with unanswered questions
+            active_num_questions = 10
+            now = datetime.now()
+            active_round: Dict[str, object] = {
+                'user_id': 1,
+                'started_at': now,
+                'ended_at': None,
+                'num_questions': active_num_questions,
+                'filters': {"mood": ["indicative"]},
+            }
+            active_guesses: List[Dict[str, object]] = []
+            for verb_name, tense, pronoun in zip(*sample_questions(active_num_questions)):
+                # Generate correct answer so we have the target, but leave user_answer/is_correct null
+                conjugation_result = generate_conjugation(verb_name, pronoun, tense)
+                if conjugation_result[0] is None:
+                    continue
+                correct_answer, _ = conjugation_result
+                active_guesses.append({
+                    'user_id': 1,
+                    'verb_id': verb_ids[verb_name],
+                    'pronoun': pronoun,
+                    'tense': tense,
+                    'mood': MoodEnum.indicative,
+                    'user_answer': None,
+                    'correct_answer': correct_answer,
+                    'is_correct': None,
+                    'created_at': now,
+                })
+            write_rounds(session, [(active_round, active_guesses)])
+            session.commit()
+            print("Created 1 active round with unanswered questions")
+            print(f"\n✅ Test data generation complete!")
+            print(f"📊 Generated:")
+            print(f"   - {len(SPANISH_VERBS)} Spanish verbs")
+            print(f"   - {total_rounds} practice rounds (0-6 per day)")
+            print(f"   - {total_questions} total questions (completed rounds)")
+            print(f"   - Data spans {months_back} months")
+            print(f"   - Focus: Indicative mood")
+            if SKIPPED_CONJUGATIONS:
+                print(f"⚠️  Skipped {sum(SKIPPED_CONJUGATIONS.values())} questions whose conjugation failed:")
+                for (verb, pronoun, tense), count in SKIPPED_CONJUGATIONS.most_common():
+                    print(f"   - {verb}/{pronoun}/{tense}: {count}")
+        except Exception as e:
+            print(f"❌ Error generating test data: {e}")
+            raise
 
 
 def main():
@@ -18,11 +18,11 @@ def main():
         print("🗃️  Loading Spanish verbs from TubeLex data...")
         
         # Import after setting path
-        from db import get_sessionmaker
+        from db import get_sync_sessionmaker
         from utils import populate_verbs_from_tubelex
         
         # Get database session
-        SessionLocal = get_sessionmaker()
+        SessionLocal = get_sync_sessionmaker()
         session = SessionLocal()
         
         try:
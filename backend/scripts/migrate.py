@@ -15,7 +15,7 @@ def main():
         print("🗄️  Starting database migration...")
         
         # Import after setting path
-        from db import get_engine
+        from db import get_sync_engine
         
         # Check if we have models defined
         try:
@@ -36,7 +36,7 @@ def main():
                 return False
         
         # Get database engine
-        engine = get_engine()
+        engine = get_sync_engine()
         print(f"📁 Using database: {engine.url}")
         
         # Create all tables if we have Base
@@ -8,7 +8,7 @@ case $MODE in
     rm -f test_app.db
     echo "🗑️  Removed test_app.db"
     export DATABASE_MODE=test
-    uv run python -c "from db import get_engine; from models import Base; Base.metadata.create_all(bind=get_engine())"
+    uv run python -c "from db import get_sync_engine; from models import Base; Base.metadata.create_all(bind=get_sync_engine())"
     uv run python generate_test_data.py
     echo "✅ Test database reset with fake data"
     ;;
@@ -16,14 +16,14 @@ case $MODE in
     rm -f app.db
     echo "🗑️  Removed app.db"
     export DATABASE_MODE=learn
-    uv run python -c "from db import get_engine; from models import Base; Base.metadata.create_all(bind=get_engine())"
+    uv run python -c "from db import get_sync_engine; from models import Base; Base.metadata.create_all(bind=get_sync_engine())"
     echo "✅ Learning database reset (clean)"
     ;;
   "dev")
     rm -f dev_app.db
     echo "🗑️  Removed dev_app.db"
     export DATABASE_MODE=dev
-    uv run python -c "from db import get_engine; from models import Base; Base.metadata.create_all(bind=get_engine())"
+    uv run python -c "from db import get_sync_engine; from models import Base; Base.metadata.create_all(bind=get_sync_engine())"
     echo "✅ Development database reset (clean)"
     ;;
   *)
@@ -5,22 +5,42 @@ Supports multiple database modes and configurations
 """
 import os
 import sys
-import subprocess
-import argparse
+from pathlib import Path
+from types import SimpleNamespace
 
-def main():
+# Ensure backend package is importable for the in-process database setup. Appended rather than
+# prepended so the sibling scripts (generate_test_data) win over same-named backend modules.
+backend_path = Path(__file__).parent.parent  # scripts -> backend
+sys.path.append(str(backend_path))
+
+# What a bare `run.py` resolves to; the parser below takes its defaults from here too
+DEFAULT_ARGS = {
+    'mode': 'learn',
+    'port': 8000,
+    'db_url': None,
+    'reset': False,
+    'no_reload': False,
+    'generate_test_data': False,
+}
+
+def parse_args():
+    # The common bare invocation needs no parsing, so skip importing and building argparse
+    if len(sys.argv) == 1:
+        return SimpleNamespace(**DEFAULT_ARGS)
+    
+    import argparse
     parser = argparse.ArgumentParser(description='Run Spanish Conjugation App')
     parser.add_argument(
         'mode', 
         nargs='?',
         choices=['test', 'learn', 'dev'],
-        default='learn',
+        default=DEFAULT_ARGS['mode'],
         help='Database mode to use (default: learn)'
     )
     parser.add_argument(
         '--port', 
         type=int, 
-        default=8000,
+        default=DEFAULT_ARGS['port'],
         help='Port to run server on (default: 8000)'
     )
     parser.add_argument(
@@ -43,7 +63,10 @@ def main():
         help='Generate test data after reset (only for test mode)'
     )
     
-    args = parser.parse_args()
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
     
     # Set environment variables based on mode
     mode_configs = {
@@ -91,22 +114,26 @@ def main():
             os.remove(db_file)
             print(f"🗑️  Removed {db_file}")
         
-        # Initialize database
-        subprocess.run([
-            sys.executable, '-c',
-            'from db import get_engine; from models import Base; Base.metadata.create_all(bind=get_engine())'
-        ])
+        # Initialize database in this process; the environment above is set before db is imported
+        from db import get_sync_engine
+        from models import Base
+        Base.metadata.create_all(bind=get_sync_engine())
+        get_sync_engine().dispose()
         
-        # Generate test data if requested and in test mode
+        # Generate test data if requested and in test mode, reusing this interpreter and its engine
         if args.generate_test_data and args.mode == 'test':
             print("🧪 Generating test data...")
-            subprocess.run([sys.executable, 'generate_test_data.py'])
+            import generate_test_data
+            generate_test_data.main()
     
     print(f"🚀 Starting {args.mode.upper()} server on port {args.port}")
     
-    # Build uvicorn command
-    cmd = [
-        'uv', 'run', 'python', '-m', 'uvicorn',
+    # Build uvicorn command; inside an active virtualenv this interpreter already has the
+    # dependencies, so skip the `uv run` resolve step
+    in_venv = sys.prefix != sys.base_prefix or bool(os.getenv('VIRTUAL_ENV'))
+    launcher = [sys.executable] if in_venv else ['uv', 'run', 'python']
+    cmd = launcher + [
+        '-m', 'uvicorn',
         'main:app',
         '--port', str(args.port)
     ]
@@ -114,8 +141,9 @@ def main():
     if not args.no_reload:
         cmd.append('--reload')
     
-    # Start server
-    subprocess.run(cmd)
+    # Start server, replacing this process rather than waiting on a child
+    sys.stdout.flush()
+    os.execvp(cmd[0], cmd)
 
 if __name__ == "__main__":
     main()
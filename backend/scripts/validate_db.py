@@ -6,29 +6,36 @@ Validates database connections and data integrity
 import os
 import sys
 import argparse
+import io
+import multiprocessing
+from contextlib import redirect_stdout
 from pathlib import Path
+from typing import Tuple
 
 # Add parent directory to path to import modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import create_engine, func, inspect
+from db import SYNC_DRIVERS, _db_url, _with_driver, get_sync_engine, get_sync_sessionmaker
+from models import Base, Verb
+
 def validate_connection(mode='learn'):
     """Validate database connection for given mode"""
     try:
         os.environ['DATABASE_MODE'] = mode
-        
-        from db import get_engine, _db_url
-        from sqlalchemy import text
-        
+        # The URL is cached per process; resolve it again for this mode
+        _db_url.cache_clear()
         url = _db_url()
         print(f"🔍 Validating {mode} mode: {url}")
         
-        engine = get_engine()
-        
-        # Test basic connection
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            result.fetchone()
-            print(f"✅ Connection successful for {mode} mode")
+        # Test basic connection on an engine for exactly this URL, not the process-wide cached one
+        engine = create_engine(_with_driver(url, SYNC_DRIVERS))
+        try:
+            with engine.connect() as conn:
+                conn.exec_driver_sql("SELECT 1").fetchone()
+                print(f"✅ Connection successful for {mode} mode")
+        finally:
+            engine.dispose()
             
         return True
         
@@ -39,19 +46,17 @@ def validate_connection(mode='learn'):
 def validate_tables():
     """Validate that required tables exist"""
     try:
-        from db import get_engine
-        from sqlalchemy import inspect
-        
-        engine = get_engine()
+        engine = get_sync_engine()
         inspector = inspect(engine)
-        tables = inspector.get_table_names()
+        tables = set(inspector.get_table_names())
         
-        required_tables = ['verbs', 'rounds', 'guesses']
+        # Every table the models declare, in declaration order
+        required_tables = list(Base.metadata.tables)
         missing_tables = [table for table in required_tables if table not in tables]
         
         if missing_tables:
             print(f"❌ Missing tables: {missing_tables}")
-            print(f"📋 Existing tables: {tables}")
+            print(f"📋 Existing tables: {sorted(tables)}")
             return False
         else:
             print(f"✅ All required tables exist: {required_tables}")
@@ -64,36 +69,23 @@ def validate_tables():
 def validate_data():
     """Validate basic data integrity"""
     try:
-        from db import get_sessionmaker
-        from models import Verb
-        
-        SessionLocal = get_sessionmaker()
+        SessionLocal = get_sync_sessionmaker()
         db = SessionLocal()
         
         try:
-            # Check if we have verbs
-            verb_count = db.query(Verb).count()
+            # Total and per-rank counts in one pass over verbs (rows without a rank never pass the filters)
+            verb_count, top10_count, top20_count, top100_count = db.query(
+                func.count(Verb.id),
+                func.count(Verb.id).filter(Verb.tubelex_rank <= 10),
+                func.count(Verb.id).filter(Verb.tubelex_rank <= 20),
+                func.count(Verb.id).filter(Verb.tubelex_rank <= 100),
+            ).one()
             print(f"📊 Total verbs in database: {verb_count}")
             
             if verb_count == 0:
                 print("⚠️  No verbs found in database")
                 return False
             
-            # Check verb classes distribution
-            # Check verb categories based on tubelex_rank
-            top10_count = db.query(Verb).filter(
-                Verb.tubelex_rank.isnot(None),
-                Verb.tubelex_rank <= 10
-            ).count()
-            top20_count = db.query(Verb).filter(
-                Verb.tubelex_rank.isnot(None),
-                Verb.tubelex_rank <= 20
-            ).count()
-            top100_count = db.query(Verb).filter(
-                Verb.tubelex_rank.isnot(None),
-                Verb.tubelex_rank <= 100
-            ).count()
-            
             print(f"📈 Verb distribution:")
             print(f"   - Top 10: {top10_count}")
             print(f"   - Top 20: {top20_count}")
@@ -128,6 +120,36 @@ def validate_environment():
         if var_value:
             print(f"   - {var_name}: {var_value}")
 
+def validate_mode(mode, check_schema=True, skip_data=False):
+    """Run the connection, table and data checks for one mode"""
+    print(f"🗄️  Validating {mode.upper()} mode:")
+    print("-" * 30)
+    
+    success = True
+    # Test connection
+    if not validate_connection(mode):
+        success = False
+    # Test tables, then data if requested
+    elif check_schema:
+        if not validate_tables():
+            success = False
+        elif not skip_data and not validate_data():
+            success = False
+    print()
+    return success
+
+def _validate_mode_isolated(job) -> Tuple[bool, str]:
+    """Pool worker: validate one mode in its own process and hand back its report.
+    
+    The database URL and engine are resolved once per process, so each mode needs a fresh one;
+    output is captured so reports from concurrent modes don't interleave.
+    """
+    mode, check_schema, skip_data = job
+    report = io.StringIO()
+    with redirect_stdout(report):
+        success = validate_mode(mode, check_schema, skip_data)
+    return success, report.getvalue()
+
 def main():
     parser = argparse.ArgumentParser(description='Validate Spanish Conjugation App Database')
     parser.add_argument(
@@ -156,35 +178,18 @@ def main():
     validate_environment()
     print()
     
-    # Determine modes to validate
     if args.all_modes:
-        modes = ['test', 'learn', 'dev']
+        # Modes are independent, so check them side by side in separate processes;
+        # tables and data are only checked for the selected mode, as before
+        jobs = [(mode, mode == args.mode, args.skip_data) for mode in ['test', 'learn', 'dev']]
+        sys.stdout.flush()
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.map(_validate_mode_isolated, jobs)
+        for _, report in results:
+            print(report, end='')
+        overall_success = all(success for success, _ in results)
     else:
-        modes = [args.mode]
-    
-    overall_success = True
-    
-    for mode in modes:
-        print(f"🗄️  Validating {mode.upper()} mode:")
-        print("-" * 30)
-        
-        # Test connection
-        if not validate_connection(mode):
-            overall_success = False
-            continue
-            
-        # Test tables (only for the current mode to avoid switching)
-        if mode == args.mode or not args.all_modes:
-            if not validate_tables():
-                overall_success = False
-                continue
-                
-            # Test data if requested
-            if not args.skip_data:
-                if not validate_data():
-                    overall_success = False
-                    
-        print()
+        overall_success = validate_mode(args.mode, skip_data=args.skip_data)
     
     # Summary
     if overall_success:
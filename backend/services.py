@@ -3,25 +3,36 @@ Service layer for business logic.
 Contains reusable functions that can be used across different routers/endpoints.
 """
 
+from functools import lru_cache
+from itertools import product
+import logging
 from typing import List, Dict, Any, Optional
 from spanishconjugator import Conjugator
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func, select
 import random
 import re
 
 from utils import normalize_pronoun, extract_conjugation_from_response
 from models import Round, Guess, TenseEnum, Verb
 
+logger = logging.getLogger("services")
+
+# The conjugator is stateless, so one instance serves the whole process. Sharing it also
+# means every caller hits the same cached_conjugation and question_pool entries,
+# which are keyed by conjugator.
+CONJUGATOR = Conjugator()
+
 
 class QuestionService:
     """Service for generating questions"""
     
-    def __init__(self, conjugator: Conjugator, db: Session):
+    def __init__(self, conjugator: Conjugator = CONJUGATOR, db: Optional[AsyncSession] = None):
         self.conjugator = conjugator
         self.db = db
     
-    def get_verbs_by_class(self, verb_class: str) -> List[str]:
+    async def get_verbs_by_class(self, verb_class: str) -> List[str]:
         """
         Get list of verb infinitives based on verb class string.
         
@@ -41,16 +52,18 @@ class QuestionService:
             limit = int(top_match.group(1))
             
             # Get top N verbs by TubeLex rank
-            verbs = (self.db.query(Verb)
-                    .filter(Verb.tubelex_rank.isnot(None))
-                    .order_by(Verb.tubelex_rank.asc())
-                    .limit(limit)
-                    .all())
+            result = await self.db.execute(
+                select(Verb.infinitive)
+                .where(Verb.tubelex_rank.isnot(None))
+                .order_by(Verb.tubelex_rank.asc())
+                .limit(limit)
+            )
+            verbs = result.scalars().all()
             
             if not verbs:
                 raise ValueError(f"No verbs found with TubeLex ranking data")
             
-            return [verb.infinitive for verb in verbs]
+            return list(verbs)
         
         # Add other verb classes here in the future
         # elif verb_class == "tricky":
@@ -62,7 +75,7 @@ class QuestionService:
                 f"Supported formats: 'top<number>' (e.g., 'top10', 'top50')"
             )
     
-    def generate_questions(
+    async def generate_questions(
         self,
         pronouns: List[str],
         tenses: List[str], 
@@ -88,50 +101,65 @@ class QuestionService:
             ValueError: If verb_class is invalid or no verbs found
         """
         # Get verbs based on class
-        verbs = self.get_verbs_by_class(verb_class)
+        verbs = await self.get_verbs_by_class(verb_class)
         
         if not verbs:
             raise ValueError(f"No verbs available for class '{verb_class}'")
-            
+        
+        # Small filter sets: conjugate every combination once, then sample distinct questions from the pool
+        if 0 < len(verbs) * len(tenses) * len(moods) * len(pronouns) <= QUESTION_POOL_MAX_COMBINATIONS:
+            pool = question_pool(
+                self.conjugator,
+                tuple(sorted(set(verbs))),
+                tuple(sorted(set(tenses))),
+                tuple(sorted(set(moods))),
+                tuple(sorted(set(pronouns)))
+            )
+            return [
+                {'pronoun': pronoun, 'tense': tense, 'mood': mood, 'verb': verb, 'answer': answer}
+                for pronoun, tense, mood, verb, answer in random.sample(pool, min(limit, len(pool)))
+            ]
+        
         questions = []
         seen_combinations = set()  # Track unique combinations
         max_attempts = limit * 5  # Increase attempts to account for duplicate avoidance
         attempts = 0
         
         while len(questions) < limit and attempts < max_attempts:
-            attempts += 1
-            
-            # Random selections
-            pronoun_choice = random.choice(pronouns)
-            tense_choice = random.choice(tenses)
-            mood_choice = random.choice(moods)
-            verb_choice = random.choice(verbs)
-            
-            # Create combination key for uniqueness check
-            combination = (pronoun_choice, verb_choice, tense_choice, mood_choice)
-            
-            # Skip if we've seen this combination before
-            if combination in seen_combinations:
-                continue
-                
-            # Generate conjugation
-            answer = self._get_conjugation(
-                verb_choice, 
-                tense_choice, 
-                mood_choice, 
-                pronoun_choice
+            # Draw one candidate per missing question, column by column
+            batch = min(limit - len(questions), max_attempts - attempts)
+            attempts += batch
+            candidates = zip(
+                random.choices(pronouns, k=batch),
+                random.choices(verbs, k=batch),
+                random.choices(tenses, k=batch),
+                random.choices(moods, k=batch)
             )
             
-            # Only add question if conjugation was successful
-            if answer and len(answer.strip()) > 0:
-                seen_combinations.add(combination)
-                questions.append({
-                    'pronoun': pronoun_choice,
-                    'tense': tense_choice,
-                    'mood': mood_choice, 
-                    'verb': verb_choice,
-                    'answer': answer
-                })
+            for combination in candidates:
+                # Skip if we've seen this combination before
+                if combination in seen_combinations:
+                    continue
+                pronoun_choice, verb_choice, tense_choice, mood_choice = combination
+                    
+                # Generate conjugation
+                answer = self._get_conjugation(
+                    verb_choice, 
+                    tense_choice, 
+                    mood_choice, 
+                    pronoun_choice
+                )
+                
+                # Only add question if conjugation was successful
+                if answer and len(answer.strip()) > 0:
+                    seen_combinations.add(combination)
+                    questions.append({
+                        'pronoun': pronoun_choice,
+                        'tense': tense_choice,
+                        'mood': mood_choice, 
+                        'verb': verb_choice,
+                        'answer': answer
+                    })
         
         return questions
     
@@ -148,38 +176,77 @@ class QuestionService:
         Returns:
             The conjugated verb form (or None if conjugation fails)
         """
-        try:
-            # Normalize pronoun for conjugator (special handling for subjunctive mood)
-            normalized_pronoun = normalize_pronoun(pronoun, mood)
-            
-            # Get conjugation response
-            conjugation_response = self.conjugator.conjugate(verb, tense, mood, normalized_pronoun)
-            
-            # Extract the correct conjugation based on mood and pronoun
-            answer = extract_conjugation_from_response(
-                conjugation_response, pronoun, mood, verb, tense
+        return cached_conjugation(self.conjugator, verb, tense, mood, pronoun)
+
+
+# Filter sets up to this many combinations are served from a precomputed pool; larger ones
+# (e.g. a wide verb class with every tense) sample lazily instead of conjugating everything up front
+QUESTION_POOL_MAX_COMBINATIONS = 2048
+
+
+@lru_cache(maxsize=256)
+def question_pool(
+    conjugator: Conjugator,
+    verbs: tuple,
+    tenses: tuple,
+    moods: tuple,
+    pronouns: tuple
+) -> List[tuple]:
+    """Every (pronoun, tense, mood, verb, answer) in the filters' cartesian product that conjugates successfully."""
+    pool = []
+    for verb, tense, mood, pronoun in product(verbs, tenses, moods, pronouns):
+        answer = cached_conjugation(conjugator, verb, tense, mood, pronoun)
+        if answer and answer.strip():
+            pool.append((pronoun, tense, mood, verb, answer))
+    return pool
+
+
+@lru_cache(maxsize=4096)
+def cached_conjugation(conjugator: Conjugator, verb: str, tense: str, mood: str, pronoun: str) -> Optional[str]:
+    """
+    Conjugate and extract the answer for one (verb, tense, mood, pronoun).
+    
+    The argument space is small and the result deterministic, so the whole pipeline
+    (pronoun normalization, conjugator lookup, extraction) is memoized per conjugator.
+    """
+    try:
+        # Normalize pronoun for conjugator (special handling for subjunctive mood)
+        normalized_pronoun = normalize_pronoun(pronoun, mood)
+        
+        # Get conjugation response
+        conjugation_response = conjugator.conjugate(verb, tense, mood, normalized_pronoun)
+        
+        # Extract the correct conjugation based on mood and pronoun
+        answer = extract_conjugation_from_response(
+            conjugation_response, pronoun, mood, verb, tense
+        )
+        
+        # Validate the answer - if it's too short, it's probably a conjugator bug
+        if answer and len(answer) < 3:
+            logger.warning(
+                "Suspiciously short conjugation for %s/%s/%s/%s: '%s'", verb, tense, mood, pronoun, answer
             )
-            
-            # Validate the answer - if it's too short, it's probably a conjugator bug
-            if answer and len(answer) < 3:
-                print(f"Warning: Suspiciously short conjugation for {verb}/{tense}/{mood}/{pronoun}: '{answer}'")
-                return None
-                
-            return answer
-            
-        except Exception as e:
-            print(f"Error conjugating {verb}/{tense}/{mood}/{pronoun}: {e}")
             return None
+            
+        return answer
+        
+    except Exception as e:
+        logger.error("Error conjugating %s/%s/%s/%s: %s", verb, tense, mood, pronoun, e)
+        return None
+
+
+# Lazy loads are not available on AsyncSession, so round reads load guesses and their verbs up front
+_WITH_GUESSES = selectinload(Round.guesses).selectinload(Guess.verb)
 
 
 class RoundService:
     """Service for managing rounds and their guesses"""
     
-    def __init__(self, question_service: QuestionService, db: Session):
+    def __init__(self, question_service: QuestionService, db: AsyncSession):
         self.question_service = question_service
         self.db = db
     
-    def create_round(
+    async def create_round(
         self,
         filters: Dict[str, List[str]],
         num_questions: int = 12,
@@ -208,10 +275,10 @@ class RoundService:
             ended_at=None
         )
         self.db.add(round_record)
-        self.db.flush()  # Get the round ID
+        await self.db.flush()  # Get the round ID
         
         # Generate questions using existing QuestionService
-        questions = self.question_service.generate_questions(
+        questions = await self.question_service.generate_questions(
             pronouns=filters['pronouns'],
             tenses=filters['tenses'],
             moods=filters['moods'],
@@ -221,7 +288,7 @@ class RoundService:
         
         # Check if we got enough questions
         if len(questions) < num_questions:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(
                 f"Could not generate enough questions. "
                 f"Requested {num_questions}, got {len(questions)}. "
@@ -231,10 +298,10 @@ class RoundService:
         guesses = []
         for question in questions:
             # Get or create verb record
-            verb = self._get_or_create_verb(question['verb'])
+            verb = await self._get_or_create_verb(question['verb'])
             
             # Create guess with retries for conjugation failures
-            guess = self._create_guess_with_retries(
+            guess = await self._create_guess_with_retries(
                 round_id=round_record.id,
                 user_id=user_id,
                 verb_id=verb.id,
@@ -246,14 +313,16 @@ class RoundService:
                 guesses.append(guess)
             else:
                 # If we couldn't create the guess after retries, rollback and fail
-                self.db.rollback()
+                await self.db.rollback()
                 raise RuntimeError(
                     f"Failed to create guess for {question['verb']} after 3 retries. "
                     f"Conjugation service may be unavailable."
                 )
         
         # Commit all changes
-        self.db.commit()
+        await self.db.commit()
+        # started_at was assigned a SQL expression; load the server-side value
+        await self.db.refresh(round_record)
         
         # Return round data with guesses
         return {
@@ -280,7 +349,7 @@ class RoundService:
             ]
         }
     
-    def complete_round(self, round_id: int) -> Dict[str, Any]:
+    async def complete_round(self, round_id: int) -> Dict[str, Any]:
         """
         Complete a round by setting ended_at and calculating num_correct_answers.
         
@@ -291,7 +360,7 @@ class RoundService:
             Dictionary containing updated round data
         """
         # Get the round, ensuring it exists
-        round_record = self.db.query(Round).filter(Round.id == round_id).first()
+        round_record = await self.db.get(Round, round_id)
         if not round_record:
             raise ValueError(f"Round with ID {round_id} not found")
         
@@ -299,16 +368,20 @@ class RoundService:
             raise ValueError(f"Round {round_id} is already completed")
         
         # Calculate number of correct answers from guesses
-        num_correct = self.db.query(Guess).filter(
-            Guess.round_id == round_id,
-            Guess.is_correct == True
-        ).count()
+        num_correct = await self.db.scalar(
+            select(func.count(Guess.id)).where(
+                Guess.round_id == round_id,
+                Guess.is_correct == True
+            )
+        )
         
         # Update round
         round_record.ended_at = func.now()
         round_record.num_correct_answers = num_correct
         
-        self.db.commit()
+        await self.db.commit()
+        # ended_at was assigned a SQL expression; load the server-side value
+        await self.db.refresh(round_record)
         
         return {
             "round": {
@@ -318,11 +391,12 @@ class RoundService:
                 "filters": round_record.filters,
                 "num_questions": round_record.num_questions,
                 "num_correct_answers": round_record.num_correct_answers,
+                "user_id": round_record.user_id,
                 "status": "completed"
             }
         }
     
-    def update_guess(self, guess_id: int, user_answer: str, is_correct: bool) -> Dict[str, Any]:
+    async def update_guess(self, guess_id: int, user_answer: str, is_correct: bool) -> Dict[str, Any]:
         """
         Update a guess with user's answer and correctness
         
@@ -334,15 +408,16 @@ class RoundService:
         Returns:
             Dictionary containing updated guess data
         """
-        guess = self.db.query(Guess).filter(Guess.id == guess_id).first()
+        guess = await self.db.scalar(
+            select(Guess).options(selectinload(Guess.verb)).where(Guess.id == guess_id)
+        )
         if not guess:
             raise ValueError(f"Guess with id {guess_id} not found")
         
         # Update the guess
         guess.user_answer = user_answer
         guess.is_correct = is_correct
-        self.db.commit()
-        self.db.refresh(guess)
+        await self.db.commit()
         
         # Return updated guess as dict
         return {
@@ -353,10 +428,11 @@ class RoundService:
             'mood': guess.mood,
             'correct_answer': guess.correct_answer,
             'user_answer': guess.user_answer,
-            'is_correct': guess.is_correct
+            'is_correct': guess.is_correct,
+            'user_id': guess.user_id
         }
     
-    def transition_to_new_round(
+    async def transition_to_new_round(
         self,
         current_round_id: int,
         new_filters: Dict[str, Any],
@@ -379,10 +455,10 @@ class RoundService:
             Dictionary containing both completed round and new round data
         """
         # Complete the current round
-        completed_round = self.complete_round(current_round_id)
+        completed_round = await self.complete_round(current_round_id)
         
         # Create a new round with the new filters
-        new_round = self.create_round(
+        new_round = await self.create_round(
             filters=new_filters,
             num_questions=num_questions,
             user_id=user_id,
@@ -396,7 +472,7 @@ class RoundService:
             "transition_reason": "filter_change"
         }
     
-    def get_active_round(self, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    async def get_active_round(self, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Get the currently active (incomplete) round for a user.
         
@@ -406,19 +482,20 @@ class RoundService:
         Returns:
             Round data if found, None otherwise
         """
-        query = self.db.query(Round).filter(Round.ended_at.is_(None))
+        query = select(Round).where(Round.ended_at.is_(None))
         
         if user_id is not None:
-            query = query.filter(Round.user_id == user_id)
+            query = query.where(Round.user_id == user_id)
         
-        # Get the most recent active round
-        round_record = query.order_by(Round.started_at.desc()).first()
+        # Get the most recent active round, with its guesses and their verbs loaded in two batched queries
+        round_record = await self.db.scalar(
+            query.options(_WITH_GUESSES).order_by(Round.started_at.desc()).limit(1)
+        )
         
         if not round_record:
             return None
         
-        # Get associated guesses
-        guesses = self.db.query(Guess).filter(Guess.round_id == round_record.id).all()
+        guesses = round_record.guesses
         
         return {
             "round": {
@@ -444,7 +521,7 @@ class RoundService:
             ]
         }
     
-    def get_round(self, round_id: int) -> Optional[Dict[str, Any]]:
+    async def get_round(self, round_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a specific round with its guesses
         
@@ -454,13 +531,12 @@ class RoundService:
         Returns:
             Round data if found, None otherwise
         """
-        round_record = self.db.query(Round).filter(Round.id == round_id).first()
+        round_record = await self.db.get(Round, round_id, options=[_WITH_GUESSES])
         
         if not round_record:
             return None
         
-        # Get associated guesses
-        guesses = self.db.query(Guess).filter(Guess.round_id == round_record.id).all()
+        guesses = round_record.guesses
         
         return {
             "round": {
@@ -487,16 +563,16 @@ class RoundService:
             ]
         }
     
-    def _get_or_create_verb(self, verb_infinitive: str) -> Verb:
+    async def _get_or_create_verb(self, verb_infinitive: str) -> Verb:
         """Get existing verb or create new one without definition"""
-        verb = self.db.query(Verb).filter(Verb.infinitive == verb_infinitive).first()
+        verb = await self.db.scalar(select(Verb).where(Verb.infinitive == verb_infinitive))
         if not verb:
             verb = Verb(infinitive=verb_infinitive, definition=None)
             self.db.add(verb)
-            self.db.flush()  # Get the verb ID
+            await self.db.flush()  # Get the verb ID
         return verb
     
-    def _create_guess_with_retries(
+    async def _create_guess_with_retries(
         self,
         round_id: int,
         user_id: Optional[int],
@@ -540,7 +616,7 @@ class RoundService:
                         created_at=func.now()
                     )
                     self.db.add(guess)
-                    self.db.flush()  # Get the guess ID
+                    await self.db.flush()  # Get the guess ID
                     return guess
                 else:
                     print(f"Attempt {attempt + 1}: Empty conjugation for {question}")
@@ -559,7 +635,7 @@ class RoundService:
 class VerbService:
     """Service for managing verbs"""
     
-    def __init__(self, conjugator: Conjugator, db: Session):
+    def __init__(self, conjugator: Conjugator, db: AsyncSession):
         self.db = db
         self.conjugator = conjugator
 
@@ -574,14 +650,14 @@ class VerbService:
         return conjugations
 
 # Convenience functions for dependency injection
-def create_question_service(conjugator: Conjugator, db: Session) -> QuestionService:
+def create_question_service(conjugator: Conjugator, db: AsyncSession) -> QuestionService:
     """Factory function to create a QuestionService instance"""
     return QuestionService(conjugator, db)
 
-def create_round_service(question_service: QuestionService, db: Session) -> RoundService:
+def create_round_service(question_service: QuestionService, db: AsyncSession) -> RoundService:
     """Factory function to create a RoundService instance"""
     return RoundService(question_service, db)
 
-def create_verb_service(conjugator: Conjugator, db: Session) -> VerbService:
+def create_verb_service(conjugator: Conjugator, db: AsyncSession) -> VerbService:
     """Factory function to create a VerbService instance"""
     return VerbService(conjugator, db)
\ No newline at end of file
@@ -3,14 +3,22 @@ Basic API endpoint tests using FastAPI TestClient.
 These are integration tests that test the full request/response cycle.
 """
 
+import asyncio
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+import main
 from main import app
 from services import QuestionService
 from dependencies import get_question_service
 from db import get_db
+from models import Base, Guess, PronounEnum, TenseEnum, MoodEnum
+from routers import metrics
 
 
 @pytest.fixture
@@ -126,3 +134,87 @@ class TestQuestionsAPI:
             limit=1,
             verb_class="top20"
         )
+
+
+class TestHealthAPI:
+    """Test the /health endpoint"""
+    
+    def test_health_ok(self, client):
+        """Health check pings the database through the session"""
+        db = Mock()
+        db.execute = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: db
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok", "db": "ok"}
+        db.execute.assert_awaited_once()
+    
+    def test_health_db_error(self, client):
+        """Health check reports 503 when the ping fails"""
+        db = Mock()
+        db.execute = AsyncMock(side_effect=OperationalError("SELECT 1", {}, Exception("down")))
+        app.dependency_overrides[get_db] = lambda: db
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 503
+        assert response.json() == {"status": "error", "db": "error"}
+    
+    def test_health_db_timeout(self, client, monkeypatch):
+        """Health check reports 503 instead of hanging when the ping doesn't answer in time"""
+        async def never_answers(*args, **kwargs):
+            await asyncio.sleep(60)
+        
+        db = Mock()
+        db.execute = never_answers
+        app.dependency_overrides[get_db] = lambda: db
+        monkeypatch.setattr(main, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.01)
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 503
+        assert response.json() == {"status": "error", "db": "error"}
+
+
+class TestMetricsActivity:
+    """Test the activity series against a real (in-memory SQLite) database"""
+    
+    def test_year_buckets_match_baseline(self):
+        """Year activity has the last 12 calendar months, oldest first, dated the 1st and labeled like %b"""
+        now = datetime.utcnow()
+        month_starts = []
+        year, month = now.year, now.month
+        for _ in range(12):
+            month_starts.insert(0, datetime(year, month, 1))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        answered_on = [month_starts[-1], month_starts[-1], month_starts[8], datetime(year, month, 1)]
+        
+        async def activity():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine) as session:
+                session.add_all(
+                    Guess(
+                        pronoun=PronounEnum.yo, tense=TenseEnum.present, mood=MoodEnum.indicative,
+                        correct_answer="hablo", user_answer="hablo", created_at=created_at
+                    )
+                    for created_at in answered_on
+                )
+                await session.commit()
+                payload = await metrics._activity_payload(session, "questions", "year", None, use_cache=False)
+            await engine.dispose()
+            return payload
+        
+        payload = asyncio.run(activity())
+        
+        # The guess from 13 months ago falls outside the window
+        expected_values = [0] * 8 + [1, 0, 0, 2]
+        assert payload["data"] == [
+            {"date": start.strftime("%Y-%m-%d"), "value": value, "label": start.strftime("%b")}
+            for start, value in zip(month_starts, expected_values)
+        ]
+        assert payload["total"] == 3
+        assert payload["average"] == 0.2
@@ -0,0 +1,39 @@
+"""Tests for the in-process TTL cache"""
+
+import time
+
+from cache import TTLCache
+
+
+def test_ttl_cache_expiry_and_eviction(monkeypatch):
+    """Test that TTLCache entries expire and the oldest entry is evicted when full"""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=60, maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+    now[0] += 61
+    assert cache.get("b") is None
+    assert cache.get("c", "missing") == "missing"
+
+
+def test_ttl_cache_discard_where():
+    """Test that discard_where drops only the matching keys"""
+    cache = TTLCache(ttl=60)
+    cache.set(("coverage", 1), "user 1")
+    cache.set(("coverage", 2), "user 2")
+    cache.set(("coverage", None), "everyone")
+
+    cache.discard_where(lambda key: key[1] in (1, None))
+
+    assert cache.get(("coverage", 1)) is None
+    assert cache.get(("coverage", None)) is None
+    assert cache.get(("coverage", 2)) == "user 2"
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from services import QuestionService
 from spanishconjugator import Conjugator
 
@@ -13,25 +13,13 @@ def mock_conjugator():
 
 @pytest.fixture 
 def mock_db():
-    """Mock database session with proper verb query mocking"""
+    """Mock async database session with proper verb query mocking"""
     db = Mock()
     
-    # Create mock verb objects  
-    mock_verb1 = Mock()
-    mock_verb1.infinitive = "hablar"
-    mock_verb1.tubelex_rank = 1
-    
-    mock_verb2 = Mock() 
-    mock_verb2.infinitive = "ser"
-    mock_verb2.tubelex_rank = 2
-    
-    mock_verb3 = Mock()
-    mock_verb3.infinitive = "tener"
-    mock_verb3.tubelex_rank = 3
-    
-    # Mock the query chain for getting verbs by class
-    mock_verbs = [mock_verb1, mock_verb2, mock_verb3]
-    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = mock_verbs
+    # Mock the execute result for getting verb infinitives by class (ordered by rank)
+    result = Mock()
+    result.scalars.return_value.all.return_value = ["hablar", "ser", "tener"]
+    db.execute = AsyncMock(return_value=result)
     
     return db
 
@@ -57,13 +45,23 @@ def real_question_service(real_conjugator, mock_db):
 class TestQuestionService:
     """Test the QuestionService class"""
     
-    def test_generate_questions_basic(self, question_service, mock_conjugator):
+    def test_conjugation_is_cached_per_conjugator(self, question_service, mock_conjugator):
+        """Test that repeated lookups reuse the cached conjugation"""
+        with patch('services.extract_conjugation_from_response', return_value="hablo"):
+            first = question_service._get_conjugation("hablar", "present", "indicative", "yo")
+            second = question_service._get_conjugation("hablar", "present", "indicative", "yo")
+        
+        assert first == second == "hablo"
+        mock_conjugator.conjugate.assert_called_once_with("hablar", "present", "indicative", "yo")
+    
+    @pytest.mark.asyncio
+    async def test_generate_questions_basic(self, question_service, mock_conjugator):
         """Test basic question generation"""
         # Mock the conjugator to return a simple response
         mock_conjugator.conjugate.return_value = "hablo"
         
         with patch('services.extract_conjugation_from_response', return_value="hablo"):
-            questions = question_service.generate_questions(
+            questions = await question_service.generate_questions(
                 pronouns=["yo"],
                 tenses=["present"], 
                 moods=["indicative"],
@@ -78,12 +76,13 @@ class TestQuestionService:
         # Verb should be one of our mocked verbs from the database
         assert questions[0]["verb"] in ["hablar", "ser", "tener"]
     
-    def test_generate_questions_custom_verbs(self, question_service, mock_conjugator):
+    @pytest.mark.asyncio
+    async def test_generate_questions_custom_verbs(self, question_service, mock_conjugator):
         """Test question generation with different verb class"""
         mock_conjugator.conjugate.return_value = "soy"
         
         with patch('services.extract_conjugation_from_response', return_value="soy"):
-            questions = question_service.generate_questions(
+            questions = await question_service.generate_questions(
                 pronouns=["yo"],
                 tenses=["present"],
                 moods=["indicative"], 
@@ -96,7 +95,8 @@ class TestQuestionService:
         # Verb should be one of our mocked verbs from the database
         assert questions[0]["verb"] in ["hablar", "ser", "tener"]
     
-    def test_generate_questions_multiple_options(self, question_service, mock_conjugator):
+    @pytest.mark.asyncio
+    async def test_generate_questions_multiple_options(self, question_service, mock_conjugator):
         """Test that random selection works with multiple options"""
         pronouns = ["yo", "tu", "el"]
         tenses = ["present", "preterite"]
@@ -105,7 +105,7 @@ class TestQuestionService:
         mock_conjugator.conjugate.return_value = "test_answer"
         
         with patch('services.extract_conjugation_from_response', return_value="test_answer"):
-            questions = question_service.generate_questions(
+            questions = await question_service.generate_questions(
                 pronouns=pronouns,
                 tenses=tenses,
                 moods=moods,
@@ -123,19 +123,37 @@ class TestQuestionService:
             assert question["verb"] in ["hablar", "ser", "tener"]
             assert question["answer"] == "test_answer"
     
-    def test_generate_questions_empty_lists(self, question_service):
+    @pytest.mark.asyncio
+    async def test_question_pool_is_built_once_per_filter_set(self, question_service):
+        """Test that repeated rounds with the same filters sample from one precomputed pool"""
+        with patch('services.cached_conjugation', return_value="test_answer") as conjugate:
+            for _ in range(2):
+                questions = await question_service.generate_questions(
+                    pronouns=["yo", "tu"],
+                    tenses=["present"],
+                    moods=["indicative"],
+                    limit=4
+                )
+                assert len(questions) == 4
+        
+        # 2 pronouns × 3 verbs × 1 tense × 1 mood, each conjugated once across both calls
+        assert conjugate.call_count == 6
+    
+    @pytest.mark.asyncio
+    async def test_generate_questions_empty_lists(self, question_service):
         """Test behavior with empty parameter lists"""
         with pytest.raises(IndexError):
-            question_service.generate_questions(
+            await question_service.generate_questions(
                 pronouns=[],
                 tenses=["present"],
                 moods=["indicative"],
                 limit=1
             )
     
-    def test_generate_questions_zero_limit(self, question_service):
+    @pytest.mark.asyncio
+    async def test_generate_questions_zero_limit(self, question_service):
         """Test with zero limit"""
-        questions = question_service.generate_questions(
+        questions = await question_service.generate_questions(
             pronouns=["yo"],
             tenses=["present"],
             moods=["indicative"],
@@ -195,13 +213,14 @@ class TestQuestionService:
             
             assert result == case["expected"], f"Failed for irregular verb {case['verb']} with {case['pronoun']}: expected {case['expected']}, got {result}"
 
-    def test_generate_questions_unique_combinations(self, question_service, mock_conjugator):
+    @pytest.mark.asyncio
+    async def test_generate_questions_unique_combinations(self, question_service, mock_conjugator):
         """Test that questions have unique combinations of pronoun, verb, tense, and mood"""
         mock_conjugator.conjugate.return_value = "test_answer"
         
         with patch('services.extract_conjugation_from_response', return_value="test_answer"):
             # Generate multiple questions with limited options to force potential duplicates
-            questions = question_service.generate_questions(
+            questions = await question_service.generate_questions(
                 pronouns=["yo", "tu"],
                 tenses=["present"],
                 moods=["indicative"],
@@ -219,14 +238,15 @@ class TestQuestionService:
         # we should get at most 6 questions
         assert len(questions) <= 6, f"Expected at most 6 unique questions, got {len(questions)}"
     
-    def test_generate_questions_insufficient_combinations(self, question_service, mock_conjugator):
+    @pytest.mark.asyncio
+    async def test_generate_questions_insufficient_combinations(self, question_service, mock_conjugator):
         """Test behavior when requesting more questions than unique combinations available"""
         mock_conjugator.conjugate.return_value = "test_answer"
         
         with patch('services.extract_conjugation_from_response', return_value="test_answer"):
             # With only 1 pronoun, 1 verb (limited by mock), 1 tense, 1 mood,
             # we can only get 3 unique combinations max (due to 3 mocked verbs)
-            questions = question_service.generate_questions(
+            questions = await question_service.generate_questions(
                 pronouns=["yo"],
                 tenses=["present"],
                 moods=["indicative"],
@@ -177,4 +177,4 @@ def test_is_verb_regular_for_tense():
     
     assert is_verb_regular_for_tense(
         'tener', 'future', 'ellos', 'indicative', 'tendrán', conjugator
-    ) is False
\ No newline at end of file
+    ) is False
@@ -1,8 +1,12 @@
 """Utility functions for validation and TubeLex data parsing"""
 
 import csv
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from spanishconjugator import Conjugator  # Add this import (adjust module name if needed)
 
@@ -115,100 +119,120 @@ def extract_conjugation_from_response(response, pronoun, mood, verb=None, tense=
     return result
 
 
-def parse_tubelex_verbs_file(file_path: str) -> List[Dict[str, Any]]:
+def iter_tubelex_verbs(file_path: str) -> Iterator[Dict[str, Any]]:
     """
-    Parses the TubeLlex verbs TSV file and returns infinitive, rank, and count. 
+    Streams the TubeLex verbs TSV file row by row, yielding infinitive, rank, and count.
     Data sourced from the Tubelex corpus of multi-lingual YouTube subtitles (https://github.com/naist-nlp/tubelex).
     
     Args:
         file_path: Path to the TSV file containing verb frequency data
         
-    Returns:
-        List of dictionaries containing infinitive, tubelex_count, and tubelex_rank
+    Yields:
+        Dictionaries containing infinitive, tubelex_count, and tubelex_rank
     """
-    verbs_data = []
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file, delimiter='\t', quoting=csv.QUOTE_NONE)
             # Skip the header line
-            next(file)
+            next(reader, None)
             
             rank = 1  # Start ranking from 1
             
-            for line in file:
-                line = line.strip()
-                if not line:
+            for parts in reader:
+                if len(parts) < 2 or not parts[0].strip():
                     continue
-                    
-                # Split by tab
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    lemm = parts[0].strip()
-                    try:
-                        count = int(parts[1].strip())
-                    except ValueError:
-                        # Skip lines where count is not a valid integer
-                        continue
-                    
-                    verb_data = {
-                        'infinitive': lemm,
-                        'tubelex_count': count,
-                        'tubelex_rank': rank
-                    }
-                    verbs_data.append(verb_data)
-                    rank += 1
+                try:
+                    count = int(parts[1].strip())
+                except ValueError:
+                    # Skip lines where count is not a valid integer
+                    continue
+                
+                yield {
+                    'infinitive': parts[0].strip(),
+                    'tubelex_count': count,
+                    'tubelex_rank': rank
+                }
+                rank += 1
                     
     except FileNotFoundError:
         raise FileNotFoundError(f"TubeLex verbs file not found at: {file_path}")
     except Exception as e:
         raise Exception(f"Error parsing TubeLex verbs file: {str(e)}")
+
+
+def parse_tubelex_verbs_file(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Parses the TubeLlex verbs TSV file and returns infinitive, rank, and count. 
+    
+    Args:
+        file_path: Path to the TSV file containing verb frequency data
+        
+    Returns:
+        List of dictionaries containing infinitive, tubelex_count, and tubelex_rank
+    """
+    return list(iter_tubelex_verbs(file_path))
+
+
+def iter_chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield consecutive lists of at most `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def tubelex_upsert(table, rows: List[Dict[str, Any]], dialect_name: str):
+    """
+    Build a single INSERT ... ON CONFLICT (infinitive) DO UPDATE for a chunk of TubeLex rows.
     
-    return verbs_data
+    Args:
+        table: Table (or lightweight sa.table) with infinitive, tubelex_count, tubelex_rank columns
+        rows: Parsed TubeLex rows
+        dialect_name: 'postgresql' or 'sqlite'
+    """
+    insert = pg_insert if dialect_name == 'postgresql' else sqlite_insert
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=['infinitive'],
+        set_={
+            'tubelex_count': stmt.excluded.tubelex_count,
+            'tubelex_rank': stmt.excluded.tubelex_rank,
+        }
+    )
 
 
-def populate_verbs_from_tubelex(session, file_path: str) -> Dict[str, int]:
+def populate_verbs_from_tubelex(session, file_path: str, chunk_size: int = 500) -> Dict[str, int]:
     """
     Populate the verbs table with TubeLex data.
     
     Args:
         session: SQLAlchemy session
         file_path: Path to the TSV file
+        chunk_size: Number of rows sent per upsert statement
         
     Returns:
         Dictionary with statistics: {'added': count, 'updated': count, 'skipped': count}
     """
     from models import Verb  # Import here to avoid circular imports
     
-    verbs_data = parse_tubelex_verbs_file(file_path)
-    
     stats = {'added': 0, 'updated': 0, 'skipped': 0}
-    
-    for verb_data in verbs_data:
-        infinitive = verb_data['infinitive']
-        tubelex_count = verb_data['tubelex_count']
-        tubelex_rank = verb_data['tubelex_rank']
-        
-        # Check if verb already exists
-        existing_verb = session.query(Verb).filter(Verb.infinitive == infinitive).first()
-        
-        if existing_verb:
-            # Update existing verb with TubeLex data
-            existing_verb.tubelex_count = tubelex_count
-            existing_verb.tubelex_rank = tubelex_rank
-            stats['updated'] += 1
-        else:
-            # Create new verb with TubeLex data
-            new_verb = Verb(
-                infinitive=infinitive,
-                tubelex_count=tubelex_count,
-                tubelex_rank=tubelex_rank
-            )
-            session.add(new_verb)
-            stats['added'] += 1
+    dialect_name = session.get_bind().dialect.name
     
     try:
+        # All chunks share the session's transaction and are committed once
+        for rows in iter_chunks(iter_tubelex_verbs(file_path), chunk_size):
+            infinitives = [row['infinitive'] for row in rows]
+            existing = session.scalar(
+                select(func.count(Verb.id)).where(Verb.infinitive.in_(infinitives))
+            )
+            session.execute(tubelex_upsert(Verb.__table__, rows, dialect_name))
+            stats['updated'] += existing
+            stats['added'] += len(rows) - existing
+        
         session.commit()
-        print(f"Successfully processed {len(verbs_data)} verbs from TubeLex data")
+        print(f"Successfully processed {stats['added'] + stats['updated']} verbs from TubeLex data")
         print(f"Added: {stats['added']}, Updated: {stats['updated']}, Skipped: {stats['skipped']}")
     except Exception as e:
         session.rollback()